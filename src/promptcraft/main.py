@@ -3,34 +3,22 @@
 import sys
 import click
 import pyperclip  # type: ignore
-from typing import Tuple
+from typing import Sequence, Tuple
 
 from . import __version__
 from .core import process_command
 from .exceptions import CommandNotFoundError, TemplateReadError
 
 
-@click.command()
-@click.version_option(version=__version__)
-@click.argument('command_name')
-@click.argument('arguments', nargs=-1)
-def promptcraft(command_name: str, arguments: Tuple[str, ...]) -> None:
-    """PromptCraft CLI - A command-line tool for managing prompt templates.
-
-    Execute slash commands to generate prompts quickly and efficiently.
-
-    Usage Examples:
-        promptcraft /create-story "Epic Story" feature
-        promptcraft /fix-bug urgent security
-        promptcraft /code-review main.py
-
-    Commands are discovered from template files in .promptcraft/commands/
-    directories, searched in current directory and user home directory.
+def _run_command(command_name: str, arguments: Sequence[str]) -> None:
+    """Generate the prompt for a slash command and copy it to the clipboard.
 
-    Generated prompts are automatically copied to your clipboard.
+    Shared by the Click command and the fast console entry point so both
+    report success and failure identically.
 
-    COMMAND_NAME: The slash command to execute (with or without leading slash)
-    ARGUMENTS: Arguments to pass to the command template
+    Args:
+        command_name: The command to execute, with or without leading slash
+        arguments: Arguments to pass to the command template
     """
     # Strip leading slash from command name if present
     if command_name.startswith('/'):
@@ -69,11 +57,52 @@ def promptcraft(command_name: str, arguments: Tuple[str, ...]) -> None:
         sys.exit(1)
 
 
+@click.command()
+@click.version_option(version=__version__)
+@click.argument('command_name')
+@click.argument('arguments', nargs=-1)
+def promptcraft(command_name: str, arguments: Tuple[str, ...]) -> None:
+    """PromptCraft CLI - A command-line tool for managing prompt templates.
+
+    Execute slash commands to generate prompts quickly and efficiently.
+
+    Usage Examples:
+        promptcraft /create-story "Epic Story" feature
+        promptcraft /fix-bug urgent security
+        promptcraft /code-review main.py
+
+    Commands are discovered from template files in .promptcraft/commands/
+    directories, searched in current directory and user home directory.
+
+    Generated prompts are automatically copied to your clipboard.
+
+    COMMAND_NAME: The slash command to execute (with or without leading slash)
+    ARGUMENTS: Arguments to pass to the command template
+    """
+    _run_command(command_name, arguments)
+
+
 # Main entry point for direct execution
 def main() -> None:
     """Main entry point when module is run directly."""
     promptcraft()
 
 
+def _fast_main() -> None:
+    """Console entry point that skips Click for plain slash commands.
+
+    ``promptcraft /command arg ...`` is dispatched straight to
+    ``_run_command``. Anything else, including options such as
+    ``--help`` or ``--version``, goes through the Click command.
+    """
+    argv = sys.argv[1:]
+    if argv and argv[0].startswith('/') and not any(
+        arg.startswith('-') for arg in argv[1:]
+    ):
+        _run_command(argv[0], argv[1:])
+    else:
+        promptcraft()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,155 @@
+"""Shared pytest fixtures for the PromptCraft test suite."""
+
+import pytest
+from pathlib import Path
+from typing import NamedTuple
+from click.testing import CliRunner
+from unittest.mock import MagicMock, patch
+
+from promptcraft import main as pm
+from promptcraft.main import promptcraft
+
+
+def pytest_ignore_collect(collection_path, config):
+    """Leave the benchmark suite out of runs that don't ask for benchmarks."""
+    if collection_path.name == "perf" and not config.getoption("benchmark_only", default=False):
+        return True
+    return None
+
+
+@pytest.fixture
+def process_command_mock(monkeypatch):
+    """Patch ``process_command`` in ``promptcraft.main``.
+
+    Returns:
+        MagicMock: The mock; tests set its return value or side effect.
+    """
+    mock = MagicMock()
+    monkeypatch.setattr(pm, 'process_command', mock)
+    return mock
+
+
+@pytest.fixture
+def pyperclip_copy_mock(monkeypatch):
+    """Patch ``pyperclip.copy`` as seen from ``promptcraft.main``.
+
+    Returns:
+        MagicMock: The mock standing in for the clipboard write.
+    """
+    mock = MagicMock()
+    monkeypatch.setattr(pm.pyperclip, 'copy', mock)
+    return mock
+
+
+class MainMocks(NamedTuple):
+    """Mocks installed by the ``patched_main`` fixture."""
+
+    process: MagicMock
+    clipboard: MagicMock
+
+
+@pytest.fixture
+def patched_main(monkeypatch):
+    """Patch the CLI's processing and clipboard collaborators.
+
+    Returns:
+        MainMocks: ``process`` replaces ``process_command`` and
+        ``clipboard`` replaces ``_copy_to_clipboard``.
+    """
+    mocks = MainMocks(process=MagicMock(), clipboard=MagicMock())
+    monkeypatch.setattr(pm, 'process_command', mocks.process)
+    monkeypatch.setattr(pm, '_copy_to_clipboard', mocks.clipboard)
+    return mocks
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """Provide one Click test runner for the whole session.
+
+    Returns:
+        CliRunner: A runner with default settings.
+    """
+    return CliRunner()
+
+
+@pytest.fixture(scope="session")
+def help_output(runner):
+    """Render ``promptcraft --help`` once per test session.
+
+    Returns:
+        str: The help text printed by the CLI.
+    """
+    result = runner.invoke(promptcraft, ['--help'])
+    assert result.exit_code == 0
+    return result.output
+
+
+@pytest.fixture
+def init_env(request):
+    """Patch ``Path`` in ``promptcraft.main`` for a ``--init`` run.
+
+    By default the commands directory mock reports that it exists and the
+    example template mock reports that it does not. Parametrize indirectly
+    with a dict to override ``template_exists`` or to make ``mkdir`` raise
+    ``mkdir_error``.
+
+    Yields:
+        tuple: ``(mock_path, mock_commands_dir, mock_exemplo_file)``.
+    """
+    options = getattr(request, 'param', {})
+    with patch.object(pm, 'Path') as mock_path:
+        mock_commands_dir = MagicMock(spec=Path)
+        mock_exemplo_file = MagicMock(spec=Path)
+        mock_path.return_value = mock_commands_dir
+        mock_commands_dir.__truediv__.return_value = mock_exemplo_file
+        mock_commands_dir.exists.return_value = True
+        mock_commands_dir.mkdir.side_effect = options.get('mkdir_error')
+        mock_exemplo_file.exists.return_value = options.get('template_exists', False)
+        yield mock_path, mock_commands_dir, mock_exemplo_file
+
+
+@pytest.fixture
+def init_dir(tmp_path, monkeypatch):
+    """Run the test from an empty scratch project directory.
+
+    Returns:
+        Path: The ``.promptcraft/commands`` directory ``--init`` creates.
+    """
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / '.promptcraft' / 'commands'
+
+
+@pytest.fixture(scope="class")
+def init_result(runner, tmp_path_factory):
+    """Run ``promptcraft --init`` once per test class in a scratch project.
+
+    The commands directory already exists and the example template does
+    not.
+
+    Returns:
+        tuple: ``(result, commands_dir)``.
+    """
+    project_dir = tmp_path_factory.mktemp('project')
+    commands_dir = project_dir / '.promptcraft' / 'commands'
+    commands_dir.mkdir(parents=True)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(project_dir)
+        result = runner.invoke(promptcraft, ['--init'])
+    return result, commands_dir
+
+
+@pytest.fixture(scope="class")
+def example_template(tmp_path_factory):
+    """Write the example template once per test class without going through Click.
+
+    Returns:
+        str: Contents of the generated ``exemplo.md``.
+    """
+    # Imported here so a tree without the --init helper still loads conftest
+    from promptcraft.main import _initialize_project
+
+    project_dir = tmp_path_factory.mktemp('project')
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(project_dir)
+        _initialize_project()
+    return (project_dir / '.promptcraft' / 'commands' / 'exemplo.md').read_text(encoding='utf-8')
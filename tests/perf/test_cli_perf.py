@@ -0,0 +1,36 @@
+"""Benchmarks for PromptCraft CLI invocations.
+
+These tests are skipped by the default test run. Run them with
+``pytest tests/perf --benchmark-only --no-cov``.
+"""
+
+import pytest
+
+from promptcraft import main as pm
+from promptcraft.main import promptcraft, _fast_main
+
+
+CLI_BUDGET_SECONDS = 0.150
+
+pytestmark = pytest.mark.benchmark(group="cli")
+
+
+def test_cli_performance_under_150ms(benchmark, process_command_mock, pyperclip_copy_mock, runner):
+    """Test that the Click command completes within the 150ms requirement."""
+    process_command_mock.return_value = "Fast prompt"
+    
+    result = benchmark(runner.invoke, promptcraft, ['/fast-command', 'arg1'])
+    
+    assert result.exit_code == 0
+    assert benchmark.stats.stats.mean < CLI_BUDGET_SECONDS
+
+
+def test_fast_main_performance_under_150ms(benchmark, process_command_mock, pyperclip_copy_mock, monkeypatch):
+    """Test that the installed entry point completes within the 150ms requirement."""
+    process_command_mock.return_value = "Fast prompt"
+    monkeypatch.setattr(pm.sys, 'argv', ['promptcraft', '/fast-command', 'arg1'])
+    
+    benchmark(_fast_main)
+    
+    process_command_mock.assert_called_with('fast-command', ['arg1'])
+    assert benchmark.stats.stats.mean < CLI_BUDGET_SECONDS
@@ -289,14 +289,12 @@ class TestCLIFlagsIntegration:
     def test_init_flag_integration(self, mock_path):
         """Test --init flag integration with CLI."""
         # Mock Path operations for initialization
-        mock_commands_dir = Mock()
+        mock_commands_dir = MagicMock(spec=Path)
         mock_path.return_value = mock_commands_dir
-        mock_commands_dir.mkdir = Mock()
         mock_commands_dir.exists.return_value = True
-        mock_exemplo_file = Mock()
-        mock_commands_dir.__truediv__ = Mock(return_value=mock_exemplo_file)
+        mock_exemplo_file = MagicMock(spec=Path)
+        mock_commands_dir.__truediv__.return_value = mock_exemplo_file
         mock_exemplo_file.exists.return_value = False
-        mock_exemplo_file.write_text = Mock()
         
         result = self.runner.invoke(promptcraft, ['--init'])
         
@@ -8,10 +8,17 @@ import os
 import tempfile
 import shutil
 from pathlib import Path
+import pytest
 from click.testing import CliRunner
 from promptcraft.main import promptcraft
 
 
+@pytest.fixture(autouse=True)
+def restore_cwd(monkeypatch):
+    """Restore the working directory the tests below chdir away from."""
+    monkeypatch.chdir(os.getcwd())
+
+
 class TestREADMEExamples:
     """Test examples from README.md to ensure accuracy."""
     
@@ -0,0 +1,113 @@
+"""Unit tests for the ``_fast_main`` console entry point."""
+
+import re
+import pytest
+from unittest.mock import patch
+
+from promptcraft import main as pm
+from promptcraft.main import _fast_main
+from promptcraft.exceptions import CommandNotFoundError
+
+
+_NOT_FOUND_RE = re.compile(r"❌ Command '/(?P<cmd>[^']+)' not found")
+
+
+def _invoke_fast(args):
+    """Run the console entry point with ``args`` as argv, bypassing Click for slash commands.
+
+    Args:
+        args: Command-line arguments following the program name.
+
+    Returns:
+        The exit code: 0 on success, otherwise the code passed to sys.exit().
+    """
+    with patch.object(pm.sys, 'argv', ['promptcraft', *args]):
+        try:
+            _fast_main()
+        except SystemExit as exc:
+            return exc.code
+    return 0
+
+
+class TestFastMainDispatch:
+    """Test how _fast_main routes argv between _run_command and Click."""
+
+    def test_fast_main_runs_slash_command_without_click(self, process_command_mock, pyperclip_copy_mock):
+        """Test that _fast_main dispatches plain slash commands directly."""
+        process_command_mock.return_value = "Fast prompt"
+
+        with patch.object(pm, 'promptcraft') as mock_promptcraft, \
+             patch.object(pm.sys, 'argv', ['promptcraft', '/fast-command', 'arg1', 'arg2']):
+            _fast_main()
+
+        mock_promptcraft.assert_not_called()
+        process_command_mock.assert_called_once_with('fast-command', ['arg1', 'arg2'])
+        pyperclip_copy_mock.assert_called_once_with("Fast prompt")
+
+    def test_fast_main_exits_1_for_missing_command(self, process_command_mock, pyperclip_copy_mock, capsys):
+        """Test that the fast path reports a missing command and exits with code 1."""
+        process_command_mock.side_effect = CommandNotFoundError("Command 'missing' not found")
+
+        with patch.object(pm, 'promptcraft') as mock_promptcraft:
+            exit_code = _invoke_fast(['/missing'])
+
+        assert exit_code == 1
+        mock_promptcraft.assert_not_called()
+        pyperclip_copy_mock.assert_not_called()
+        match = _NOT_FOUND_RE.search(capsys.readouterr().out)
+        assert match is not None
+        assert match.group("cmd") == "missing"
+
+    @pytest.mark.parametrize("argv", [
+        ['promptcraft'],
+        ['promptcraft', '--help'],
+        ['promptcraft', '--version'],
+        ['promptcraft', 'no-slash'],
+        ['promptcraft', '/command', '--help'],
+    ], ids=['no-args', 'help', 'version', 'no-slash', 'trailing-option'])
+    def test_fast_main_falls_back_to_click(self, argv):
+        """Test that _fast_main hands anything but a plain slash command to Click."""
+        with patch.object(pm, 'promptcraft') as mock_promptcraft, \
+             patch.object(pm, '_run_command') as mock_run_command, \
+             patch.object(pm.sys, 'argv', argv):
+            _fast_main()
+
+        mock_promptcraft.assert_called_once()
+        mock_run_command.assert_not_called()
+
+
+class TestFastMainRepeatedRuns:
+    """Test _fast_main across several invocations in one process."""
+
+    def test_fast_main_repeated_invocations_succeed(self, process_command_mock, pyperclip_copy_mock):
+        """Test repeated fast-path invocations each process and copy the prompt."""
+        process_command_mock.return_value = "Fast startup"
+
+        for _ in range(5):
+            assert _invoke_fast(['/startup-test']) == 0
+        assert process_command_mock.call_count == 5
+        assert pyperclip_copy_mock.call_count == 5
+
+    def test_cli_memory_usage_pattern(self, process_command_mock, pyperclip_copy_mock):
+        """Test CLI memory usage remains stable across multiple invocations."""
+        import tracemalloc
+
+        process_command_mock.return_value = "Memory test"
+
+        # Leave an outer trace (PYTHONTRACEMALLOC, -X tracemalloc) running
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            # Warm up once so first-call allocations don't count as growth
+            assert _invoke_fast(['/memory-test-warmup']) == 0
+            before = tracemalloc.take_snapshot()
+            for i in range(3):
+                assert _invoke_fast([f'/memory-test-{i}']) == 0
+            after = tracemalloc.take_snapshot()
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+        growth = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+        assert growth < 200_000
@@ -1,284 +1,240 @@
 """Unit tests for the PromptCraft CLI main module."""
 
+import itertools
+import re
 import pytest
-from unittest.mock import Mock, patch, call
-from click.testing import CliRunner
+from unittest.mock import DEFAULT, patch
 import os
-import time
+from pathlib import Path
 
+from promptcraft.core import CommandInfo
+from promptcraft import main as pm
 from promptcraft.main import promptcraft, main, _copy_to_clipboard, _is_headless_environment
 from promptcraft.exceptions import CommandNotFoundError, TemplateReadError
 
 
+_SUCCESS_RE = re.compile(r"✅ Prompt for '/(?P<cmd>[^']+)' copied to clipboard!")
+_GENERATED_RE = re.compile(r"✅ Prompt for '/(?P<cmd>[^']+)' generated:")
+_NOT_FOUND_RE = re.compile(r"❌ Command '/(?P<cmd>[^']+)' not found")
+
+HEADLESS_CASES = [
+    ({'CI': 'true'}, True),
+    ({'DISPLAY': ''}, True),
+    ({'PROMPTCRAFT_NO_CLIPBOARD': 'true'}, True),
+    ({'DISPLAY': ':0'}, False),
+]
+
+
+def _matched_cmd(pattern, output):
+    """Return the command name captured by ``pattern`` in ``output``.
+    
+    Args:
+        pattern: One of the ``_*_RE`` message patterns.
+        output: CLI output to search.
+        
+    Returns:
+        The ``cmd`` group of the first match.
+    """
+    match = pattern.search(output)
+    assert match is not None, f"{pattern.pattern!r} not found in output:\n{output}"
+    return match.group("cmd")
+
+
+def _invoke_callback(args):
+    """Run the promptcraft callback directly, without CliRunner isolation.
+    
+    Args:
+        args: Command-line arguments to parse into callback parameters.
+        
+    Returns:
+        The exit code: 0 on success, otherwise the code passed to sys.exit().
+    """
+    ctx = promptcraft.make_context('promptcraft', list(args))
+    try:
+        with ctx:
+            ctx.invoke(promptcraft.callback, **ctx.params)
+    except SystemExit as exc:
+        return exc.code
+    return 0
+
+
 class TestPromptCraftCLI:
     """Test cases for the PromptCraft CLI framework."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_command_execution_success(self, mock_copy_clipboard_clipboard, mock_process):
+    def test_command_execution_success(self, patched_main, runner):
         """Test successful command execution with slash prefix."""
         # Arrange
-        mock_process.return_value = "Generated prompt content"
-        mock_copy_clipboard_clipboard.return_value = True
+        patched_main.process.return_value = "Generated prompt content"
+        patched_main.clipboard.return_value = True
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/test-command', 'arg1', 'arg2'])
+        result = runner.invoke(promptcraft, ['/test-command', 'arg1', 'arg2'])
         
         # Assert
         assert result.exit_code == 0
-        mock_process.assert_called_once_with('test-command', ['arg1', 'arg2'])
-        mock_copy_clipboard_clipboard.assert_called_once_with("Generated prompt content", "test-command")
-        assert "Prompt for '/test-command' copied to clipboard!" in result.output
+        patched_main.process.assert_called_once_with('test-command', ['arg1', 'arg2'])
+        patched_main.clipboard.assert_called_once_with("Generated prompt content", "test-command")
+        assert _matched_cmd(_SUCCESS_RE, result.output) == "test-command"
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_command_execution_without_slash(self, mock_copy_clipboard, mock_process):
+    def test_command_execution_without_slash(self, patched_main, runner):
         """Test successful command execution without slash prefix."""
         # Arrange
-        mock_process.return_value = "Generated prompt content"
+        patched_main.process.return_value = "Generated prompt content"
         
         # Act
-        result = self.runner.invoke(promptcraft, ['test-command', 'arg1', 'arg2'])
+        result = runner.invoke(promptcraft, ['test-command', 'arg1', 'arg2'])
         
         # Assert
         assert result.exit_code == 0
-        mock_process.assert_called_once_with('test-command', ['arg1', 'arg2'])
-        mock_copy_clipboard.assert_called_once_with("Generated prompt content", "test-command")
-        assert "Prompt for '/test-command' copied to clipboard!" in result.output
+        patched_main.process.assert_called_once_with('test-command', ['arg1', 'arg2'])
+        patched_main.clipboard.assert_called_once_with("Generated prompt content", "test-command")
+        assert _matched_cmd(_SUCCESS_RE, result.output) == "test-command"
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_command_execution_no_arguments(self, mock_copy_clipboard, mock_process):
+    def test_command_execution_no_arguments(self, patched_main, runner):
         """Test command execution with no arguments."""
         # Arrange
-        mock_process.return_value = "Simple prompt"
+        patched_main.process.return_value = "Simple prompt"
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/simple'])
+        result = runner.invoke(promptcraft, ['/simple'])
         
         # Assert
         assert result.exit_code == 0
-        mock_process.assert_called_once_with('simple', [])
-        mock_copy_clipboard.return_value = True
-        mock_copy_clipboard.assert_called_once_with("Simple prompt")
-        assert " Prompt for '/simple' copied to clipboard!" in result.output
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_command_execution_multiple_arguments(self, mock_copy_clipboard, mock_process):
+        patched_main.process.assert_called_once_with('simple', [])
+        patched_main.clipboard.assert_called_once_with("Simple prompt", "simple")
+        assert _matched_cmd(_SUCCESS_RE, result.output) == "simple"
+    
+    def test_command_execution_multiple_arguments(self, patched_main, capsys):
         """Test command execution with multiple arguments including spaces."""
         # Arrange
-        mock_process.return_value = "Complex prompt"
+        patched_main.process.return_value = "Complex prompt"
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/complex-command', 'arg with spaces', 'arg2', 'arg3'])
+        exit_code = _invoke_callback(['/complex-command', 'arg with spaces', 'arg2', 'arg3'])
         
         # Assert
-        assert result.exit_code == 0
-        mock_process.assert_called_once_with('complex-command', ['arg with spaces', 'arg2', 'arg3'])
-        mock_copy_clipboard.return_value = True
-        mock_copy_clipboard.assert_called_once_with("Complex prompt")
-        assert " Prompt for '/complex-command' copied to clipboard!" in result.output
-    
-    def test_slash_stripping_logic(self):
+        assert exit_code == 0
+        patched_main.process.assert_called_once_with('complex-command', ['arg with spaces', 'arg2', 'arg3'])
+        patched_main.clipboard.assert_called_once_with("Complex prompt", "complex-command")
+        assert _matched_cmd(_SUCCESS_RE, capsys.readouterr().out) == "complex-command"
+    
+    @pytest.mark.parametrize("input_name,expected", [
+        ('/command', 'command'),
+        ('command', 'command'),
+        ('//command', '/command'),  # Only strips first slash
+        ('/command/sub', 'command/sub'),
+    ], ids=['slash', 'no-slash', 'double-slash', 'nested-path'])
+    def test_slash_stripping_logic(self, process_command_mock, pyperclip_copy_mock, input_name, expected, runner):
         """Test that slash stripping works correctly."""
-        # Test cases for slash stripping
-        test_cases = [
-            ('/command', 'command'),
-            ('command', 'command'),
-            ('//command', '/command'),  # Only strips first slash
-            ('/command/sub', 'command/sub'),
-            ('', ''),
-        ]
-        
-        for input_name, expected in test_cases:
-            with patch('promptcraft.main.process_command') as mock_process, \
-                 patch('promptcraft.main.pyperclip.copy'):
-                mock_process.return_value = "test"
-                
-                result = self.runner.invoke(promptcraft, [input_name])
-                
-                if input_name:  # Skip empty string case
-                    mock_process.assert_called_once_with(expected, [])
-    
-    @patch('promptcraft.main.process_command')
-    def test_command_not_found_error_handling(self, mock_process):
-        """Test CommandNotFoundError handling with user-friendly message and exit code."""
-        # Arrange
-        mock_process.side_effect = CommandNotFoundError("Command 'nonexistent' not found")
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['/nonexistent'])
+        process_command_mock.return_value = "test"
         
-        # Assert
-        assert result.exit_code == 1
-        assert " Command '/nonexistent' not found" in result.output
-        assert "Run 'promptcraft --list' to see available commands" in result.output
-    
-    @patch('promptcraft.main.process_command')
-    def test_template_read_error_handling(self, mock_process):
-        """Test TemplateReadError handling with file path information and exit code."""
-        # Arrange
-        mock_process.side_effect = TemplateReadError("Failed to read template file '/path/to/template.txt'")
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['/broken'])
+        result = runner.invoke(promptcraft, [input_name], standalone_mode=False)
         
-        # Assert
-        assert result.exit_code == 1
-        assert " Failed to read template file '/path/to/template.txt'" in result.output
-    
-    @patch('promptcraft.main.process_command')
-    def test_generic_exception_handling(self, mock_process):
-        """Test generic exception handling with user-friendly message and exit code."""
+        assert result.exit_code == 0
+        process_command_mock.assert_called_once_with(expected, [])
+    
+    @pytest.mark.parametrize("exception,command,expected_fragments", [
+        (CommandNotFoundError("Command 'nonexistent' not found"), '/nonexistent',
+         ("Run 'promptcraft --list' to see available commands",)),
+        (TemplateReadError("Failed to read template file '/path/to/template.txt'"), '/broken',
+         (" Failed to read template file '/path/to/template.txt'",)),
+        (RuntimeError("Unexpected system error"), '/error', (" Unexpected error occurred",)),
+        (ValueError("Some error"), '/generic-error', (" Unexpected error occurred",)),
+    ], ids=['command-not-found', 'template-read-error', 'runtime-error', 'value-error'])
+    def test_error_handling(self, process_command_mock, exception, command, expected_fragments, runner):
+        """Test error messages and exit codes for each handled exception type."""
         # Arrange
-        mock_process.side_effect = RuntimeError("Unexpected system error")
+        process_command_mock.side_effect = exception
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/error'])
+        result = runner.invoke(promptcraft, [command])
         
         # Assert
         assert result.exit_code == 1
-        assert " Unexpected error occurred" in result.output
+        if isinstance(exception, CommandNotFoundError):
+            assert _matched_cmd(_NOT_FOUND_RE, result.output) == command[1:]
+        for fragment in expected_fragments:
+            assert fragment in result.output
         # Ensure traceback is not exposed to user
-        assert "RuntimeError" not in result.output
         assert "Traceback" not in result.output
+        if not isinstance(exception, (CommandNotFoundError, TemplateReadError)):
+            assert exception.__class__.__name__ not in result.output
     
-    @patch('promptcraft.main.process_command')
-    def test_red_color_formatting_for_errors(self, mock_process):
-        """Test that all error messages use red color formatting."""
-        # Test CommandNotFoundError
-        mock_process.side_effect = CommandNotFoundError("Command not found")
-        result = self.runner.invoke(promptcraft, ['/missing'])
-        assert result.exit_code == 1
-        # Note: Color testing in CLI is complex, but we can verify the message appears
-        assert " Command '/missing' not found" in result.output
-        
-        # Test TemplateReadError
-        mock_process.side_effect = TemplateReadError("Template error")
-        result = self.runner.invoke(promptcraft, ['/template-error'])
-        assert result.exit_code == 1
-        assert " Template error" in result.output
-        
-        # Test generic exception
-        mock_process.side_effect = ValueError("Some error")
-        result = self.runner.invoke(promptcraft, ['/generic-error'])
-        assert result.exit_code == 1
-        assert " Unexpected error occurred" in result.output
-    
-    @patch('promptcraft.main.process_command')
-    def test_exit_codes_for_all_scenarios(self, mock_process):
+    @pytest.mark.parametrize("error,command,expected_exit_code", [
+        (None, '/success', 0),
+        (CommandNotFoundError("Not found"), '/not-found', 1),
+        (TemplateReadError("Read error"), '/read-error', 1),
+        (Exception("Generic error"), '/generic', 1),
+    ], ids=['success', 'command-not-found', 'template-read-error', 'generic-error'])
+    def test_exit_codes_for_all_scenarios(self, process_command_mock, error, command, expected_exit_code, runner):
         """Test proper exit codes for success and error scenarios."""
-        # Test success scenario (exit code 0)
-        mock_process.return_value = "Success"
-        result = self.runner.invoke(promptcraft, ['/success'])
-        assert result.exit_code == 0
-        
-        # Test CommandNotFoundError (exit code 1)
-        mock_process.side_effect = CommandNotFoundError("Not found")
-        result = self.runner.invoke(promptcraft, ['/not-found'])
-        assert result.exit_code == 1
+        process_command_mock.return_value = "Success"
+        process_command_mock.side_effect = error
         
-        # Test TemplateReadError (exit code 1)
-        mock_process.side_effect = TemplateReadError("Read error")
-        result = self.runner.invoke(promptcraft, ['/read-error'])
-        assert result.exit_code == 1
+        result = runner.invoke(promptcraft, [command], standalone_mode=False)
         
-        # Test generic exception (exit code 1)
-        mock_process.side_effect = Exception("Generic error")
-        result = self.runner.invoke(promptcraft, ['/generic'])
-        assert result.exit_code == 1
+        assert result.exit_code == expected_exit_code
     
-    @patch('promptcraft.main.process_command')
-    def test_helpful_suggestion_messages(self, mock_process):
-        """Test that error messages include helpful suggestions."""
-        # Test CommandNotFoundError includes helpful suggestion
-        mock_process.side_effect = CommandNotFoundError("Command not found")
-        result = self.runner.invoke(promptcraft, ['/unknown'])
+    def test_clipboard_integration_called(self, patched_main):
+        """Test that pyperclip.copy is called with correct content."""
+        patched_main.process.return_value = "Test clipboard content"
         
-        assert result.exit_code == 1
-        assert " Command '/unknown' not found" in result.output
-        assert "Run 'promptcraft --list' to see available commands" in result.output
+        assert _invoke_callback(['/test']) == 0
+        patched_main.clipboard.assert_called_once_with("Test clipboard content", "test")
     
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_clipboard_integration_called(self, mock_copy_clipboard):
-        """Test that pyperclip.copy is called with correct content."""
-        with patch('promptcraft.main.process_command') as mock_process:
-            mock_process.return_value = "Test clipboard content"
-            
-            result = self.runner.invoke(promptcraft, ['/test'])
-            
-            assert result.exit_code == 0
-            mock_copy_clipboard.return_value = True
-        mock_copy_clipboard.assert_called_once_with("Test clipboard content")
-    
-    def test_success_message_formatting(self):
+    def test_success_message_formatting(self, process_command_mock, pyperclip_copy_mock, runner):
         """Test that success message is properly formatted with green color."""
-        with patch('promptcraft.main.process_command') as mock_process, \
-             patch('promptcraft.main.pyperclip.copy'):
-            mock_process.return_value = "test content"
-            
-            result = self.runner.invoke(promptcraft, ['/test-format'])
-            
-            assert result.exit_code == 0
-            # Check for green color formatting in output
-            assert " Prompt for '/test-format' copied to clipboard!" in result.output
-    
-    def test_help_text_display(self):
-        """Test that help text is properly displayed."""
-        result = self.runner.invoke(promptcraft, ['--help'])
+        process_command_mock.return_value = "test content"
+        result = runner.invoke(promptcraft, ['/test-format'])
         
         assert result.exit_code == 0
-        assert "PromptCraft CLI - A command-line tool for managing prompt templates." in result.output
-        assert "Execute slash commands to generate prompts quickly and efficiently." in result.output
-        assert "Usage Examples:" in result.output
-        assert "promptcraft /create-story" in result.output
+        # Check for green color formatting in output
+        assert _matched_cmd(_SUCCESS_RE, result.output) == "test-format"
+    
+    def test_help_text_display(self, help_output):
+        """Test that help text is properly displayed."""
+        assert "PromptCraft CLI - A command-line tool for managing prompt templates." in help_output
+        assert "Execute slash commands to generate prompts quickly and efficiently." in help_output
+        assert "Usage Examples:" in help_output
+        assert "promptcraft /create-story" in help_output
     
-    def test_version_option(self):
+    def test_version_option(self, runner):
         """Test that version option works correctly."""
-        result = self.runner.invoke(promptcraft, ['--version'])
+        result = runner.invoke(promptcraft, ['--version'], standalone_mode=False)
         
         assert result.exit_code == 0
         # Version output format varies, just ensure it doesn't crash
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_special_characters_in_command_name(self, mock_copy_clipboard, mock_process):
+    def test_special_characters_in_command_name(self, patched_main, runner):
         """Test command names with special characters."""
         # Arrange
-        mock_process.return_value = "Special prompt"
+        patched_main.process.return_value = "Special prompt"
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/test-command-with_underscores'])
+        result = runner.invoke(promptcraft, ['/test-command-with_underscores'])
         
         # Assert
         assert result.exit_code == 0
-        mock_process.assert_called_once_with('test-command-with_underscores', [])
-        assert " Prompt for '/test-command-with_underscores' copied to clipboard!" in result.output
+        patched_main.process.assert_called_once_with('test-command-with_underscores', [])
+        assert _matched_cmd(_SUCCESS_RE, result.output) == "test-command-with_underscores"
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_arguments_with_special_characters(self, mock_copy_clipboard, mock_process):
+    def test_arguments_with_special_characters(self, patched_main, runner):
         """Test arguments containing special characters."""
         # Arrange
-        mock_process.return_value = "Special args prompt"
+        patched_main.process.return_value = "Special args prompt"
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/test', 'arg@with#special$chars', 'normal-arg'])
+        result = runner.invoke(promptcraft, ['/test', 'arg@with#special$chars', 'normal-arg'], standalone_mode=False)
         
         # Assert
         assert result.exit_code == 0
-        mock_process.assert_called_once_with('test', ['arg@with#special$chars', 'normal-arg'])
+        patched_main.process.assert_called_once_with('test', ['arg@with#special$chars', 'normal-arg'])
 
 
 class TestMainFunction:
     """Test cases for the main entry point function."""
     
-    @patch('promptcraft.main.promptcraft')
+    @patch.object(pm, 'promptcraft')
     def test_main_function_calls_promptcraft(self, mock_promptcraft):
         """Test that main() function properly calls promptcraft()."""
         # Act
@@ -292,486 +248,327 @@ class TestMainFunction:
         # Test that the main function exists and is callable
         assert callable(main)
         
-        with patch('promptcraft.main.promptcraft') as mock_promptcraft:
+        with patch.object(pm, 'promptcraft') as mock_promptcraft:
             main()
             mock_promptcraft.assert_called_once()
 
 
-class TestCLIPerformance:
-    """Performance-related tests for CLI operations."""
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_cli_performance_under_150ms(self, mock_copy_clipboard, mock_process):
-        """Test that CLI operations complete within 150ms requirement."""
-        import time
-        
-        # Arrange
-        mock_process.return_value = "Fast prompt"
-        runner = CliRunner()
-        
-        # Act
-        start_time = time.time()
-        result = runner.invoke(promptcraft, ['/fast-command', 'arg1'])
-        end_time = time.time()
-        
-        # Assert
-        assert result.exit_code == 0
-        execution_time = (end_time - start_time) * 1000  # Convert to milliseconds
-        # Note: This test may be environment-dependent, but should generally pass
-        # Removed strict assertion to avoid flaky tests, but keeping structure
-        # assert execution_time < 150, f"CLI took {execution_time}ms, exceeding 150ms limit"
-
-
-class TestCLIIntegration:
-    """Integration tests for CLI with core module."""
-    
-    def test_cli_integration_with_core_module(self):
-        """Test that CLI properly integrates with process_command from core."""
-        runner = CliRunner()
-        
-        # This test verifies the import works correctly
-        result = runner.invoke(promptcraft, ['--help'])
-        assert result.exit_code == 0
-        # If imports failed, this would raise an ImportError
+def test_cli_integration_with_core_module(help_output):
+    """Test that CLI properly integrates with process_command from core."""
+    # This test verifies the import works correctly
+    assert "Usage:" in help_output
+    # If imports failed, this would raise an ImportError
 
 
 class TestEdgeCases:
     """Test edge cases and error conditions."""
     
-    def test_empty_command_name_handling(self):
+    def test_empty_command_name_handling(self, runner):
         """Test handling of empty command names."""
-        runner = CliRunner()
-        
         # Act - try to invoke with empty string (should fail at Click level)
         result = runner.invoke(promptcraft, [''])
         
         # Click should handle this gracefully, either processing or erroring appropriately
         # The specific behavior depends on Click's argument validation
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_unicode_arguments(self, mock_copy_clipboard, mock_process):
+    def test_unicode_arguments(self, patched_main, runner):
         """Test handling of Unicode characters in arguments."""
         # Arrange
-        mock_process.return_value = "Unicode prompt"
-        runner = CliRunner()
+        patched_main.process.return_value = "Unicode prompt"
         
         # Act
-        result = runner.invoke(promptcraft, ['/test', 'café', '漢字', 'émojis😊'])
+        result = runner.invoke(promptcraft, ['/test', 'café', '漢字', 'émojis😊'], standalone_mode=False)
         
         # Assert
         assert result.exit_code == 0
-        mock_process.assert_called_once_with('test', ['café', '漢字', 'émojis😊'])
+        patched_main.process.assert_called_once_with('test', ['café', '漢字', 'émojis😊'])
 
 
 class TestErrorHandlingEdgeCases:
     """Test edge cases for error handling implementation."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-    
-    @patch('promptcraft.main.process_command')
-    def test_unicode_in_error_messages(self, mock_process):
+    def test_unicode_in_error_messages(self, process_command_mock, runner):
         """Test error handling with Unicode characters in error messages."""
         # Test CommandNotFoundError with Unicode command name
-        mock_process.side_effect = CommandNotFoundError("Command not found")
-        result = self.runner.invoke(promptcraft, ['/café-command'])
+        process_command_mock.side_effect = CommandNotFoundError("Command not found")
+        result = runner.invoke(promptcraft, ['/café-command'])
         
         assert result.exit_code == 1
-        assert " Command '/café-command' not found" in result.output
+        assert _matched_cmd(_NOT_FOUND_RE, result.output) == "café-command"
         assert "Run 'promptcraft --list' to see available commands" in result.output
     
-    @patch('promptcraft.main.process_command')
-    def test_very_long_file_paths_in_error(self, mock_process):
+    def test_very_long_file_paths_in_error(self, process_command_mock, runner):
         """Test TemplateReadError handling with very long file paths."""
         # Arrange
         long_path = "/very/long/path/to/template/" * 10 + "template.txt"
-        mock_process.side_effect = TemplateReadError(f"Failed to read template file '{long_path}'")
+        process_command_mock.side_effect = TemplateReadError(f"Failed to read template file '{long_path}'")
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/long-path'])
+        result = runner.invoke(promptcraft, ['/long-path'])
         
         # Assert
         assert result.exit_code == 1
         assert f" Failed to read template file '{long_path}'" in result.output
     
-    @patch('promptcraft.main.process_command')
-    def test_special_characters_in_command_name_error(self, mock_process):
+    @pytest.mark.parametrize("cmd", [
+        '/test@command', '/test#command', '/test$command', '/test%command',
+    ])
+    def test_special_characters_in_command_name_error(self, process_command_mock, cmd, runner):
         """Test error messages with special characters in command names."""
-        # Test with special characters that might cause issues
-        special_commands = ['/test@command', '/test#command', '/test$command', '/test%command']
-        
-        for cmd in special_commands:
-            mock_process.side_effect = CommandNotFoundError(f"Command not found")
-            result = self.runner.invoke(promptcraft, [cmd])
-            
-            assert result.exit_code == 1
-            assert f" Command '{cmd}' not found" in result.output
-            assert "Run 'promptcraft --list' to see available commands" in result.output
-    
-    @patch('promptcraft.main.process_command')
-    def test_no_traceback_exposure_for_various_exceptions(self, mock_process):
+        process_command_mock.side_effect = CommandNotFoundError("Command not found")
+        
+        result = runner.invoke(promptcraft, [cmd])
+        
+        assert result.exit_code == 1
+        assert _matched_cmd(_NOT_FOUND_RE, result.output) == cmd[1:]
+        assert "Run 'promptcraft --list' to see available commands" in result.output
+    
+    @pytest.mark.parametrize("exception", [
+        ValueError("Value error"),
+        TypeError("Type error"),
+        IOError("IO error"),
+        RuntimeError("Runtime error"),
+        KeyError("Key error"),
+        AttributeError("Attribute error")
+    ], ids=lambda exception: exception.__class__.__name__)
+    def test_no_traceback_exposure_for_various_exceptions(self, process_command_mock, exception, runner):
         """Test that various exception types don't expose tracebacks to users."""
-        exception_types = [
-            ValueError("Value error"),
-            TypeError("Type error"),
-            IOError("IO error"),
-            RuntimeError("Runtime error"),
-            KeyError("Key error"),
-            AttributeError("Attribute error")
-        ]
+        process_command_mock.side_effect = exception
         
-        for exception in exception_types:
-            mock_process.side_effect = exception
-            result = self.runner.invoke(promptcraft, ['/test-exception'])
-            
-            assert result.exit_code == 1
-            assert " Unexpected error occurred" in result.output
-            # Ensure no traceback or exception details are exposed
-            assert "Traceback" not in result.output
-            assert exception.__class__.__name__ not in result.output
-            assert str(exception) not in result.output
+        result = runner.invoke(promptcraft, ['/test-exception'])
+        
+        assert result.exit_code == 1
+        assert " Unexpected error occurred" in result.output
+        # Ensure no traceback or exception details are exposed
+        assert "Traceback" not in result.output
+        assert exception.__class__.__name__ not in result.output
+        assert str(exception) not in result.output
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_error_handling_preserves_existing_functionality(self, mock_copy_clipboard, mock_process):
+    def test_error_handling_preserves_existing_functionality(self, patched_main, capsys):
         """Test that error handling doesn't break existing successful operations."""
         # Test that successful operations still work after error handling implementation
-        mock_process.return_value = "Generated prompt content"
+        patched_main.process.return_value = "Generated prompt content"
         
-        result = self.runner.invoke(promptcraft, ['/working-command', 'arg1', 'arg2'])
+        exit_code = _invoke_callback(['/working-command', 'arg1', 'arg2'])
         
-        assert result.exit_code == 0
-        mock_process.assert_called_once_with('working-command', ['arg1', 'arg2'])
-        mock_copy_clipboard.assert_called_once_with("Generated prompt content", "test-command")
-        assert " Prompt for '/working-command' copied to clipboard!" in result.output
+        assert exit_code == 0
+        patched_main.process.assert_called_once_with('working-command', ['arg1', 'arg2'])
+        patched_main.clipboard.assert_called_once_with("Generated prompt content", "working-command")
+        assert _matched_cmd(_SUCCESS_RE, capsys.readouterr().out) == "working-command"
 
 
 class TestStdoutFunctionality:
     """Test cases for --stdout flag functionality."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-    
-    @patch('promptcraft.main.process_command')
-    def test_stdout_flag_presence_and_parsing(self, mock_process):
+    def test_stdout_flag_presence_and_parsing(self, process_command_mock, runner):
         """Test --stdout flag is properly parsed by Click framework."""
         # Arrange
-        mock_process.return_value = "Test prompt output"
+        process_command_mock.return_value = "Test prompt output"
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--stdout', '/test-command', 'arg1'])
+        result = runner.invoke(promptcraft, ['--stdout', '/test-command', 'arg1'], standalone_mode=False)
         
         # Assert
         assert result.exit_code == 0
-        mock_process.assert_called_once_with('test-command', ['arg1'])
+        process_command_mock.assert_called_once_with('test-command', ['arg1'])
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_terminal_output_instead_of_clipboard_when_stdout_flag_used(self, mock_copy_clipboard, mock_process):
+    def test_terminal_output_instead_of_clipboard_when_stdout_flag_used(self, patched_main, runner):
         """Test terminal output instead of clipboard when --stdout flag is used."""
         # Arrange
-        mock_process.return_value = "Test prompt content for terminal"
+        patched_main.process.return_value = "Test prompt content for terminal"
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--stdout', '/test-command'])
+        result = runner.invoke(promptcraft, ['--stdout', '/test-command'])
         
         # Assert
         assert result.exit_code == 0
         # Verify pyperclip.copy is NOT called when --stdout flag is used
-        mock_copy_clipboard.assert_not_called()
+        patched_main.clipboard.assert_not_called()
         # Verify prompt content appears in terminal output
         assert "Test prompt content for terminal" in result.output
     
-    @patch('promptcraft.main.process_command')
-    def test_success_message_changes_with_stdout_flag(self, mock_process):
+    def test_success_message_changes_with_stdout_flag(self, process_command_mock, runner):
         """Test success message changes to 'generated:' when --stdout flag is used."""
         # Arrange
-        mock_process.return_value = "Generated prompt"
+        process_command_mock.return_value = "Generated prompt"
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--stdout', '/test-command'])
+        result = runner.invoke(promptcraft, ['--stdout', '/test-command'])
         
         # Assert
         assert result.exit_code == 0
-        assert " Prompt for '/test-command' generated:" in result.output
+        assert _matched_cmd(_GENERATED_RE, result.output) == "test-command"
         # Ensure the old clipboard message is NOT present
-        assert "copied to clipboard!" not in result.output
+        assert _SUCCESS_RE.search(result.output) is None
     
-    @patch('promptcraft.main.process_command')
-    def test_prompt_formatting_for_terminal_display(self, mock_process):
+    def test_prompt_formatting_for_terminal_display(self, process_command_mock, capsys):
         """Test prompt content formatting and display in terminal environment."""
         # Arrange
         multi_line_prompt = """This is a multi-line prompt
         with proper indentation
         and various content formatting"""
-        mock_process.return_value = multi_line_prompt
+        process_command_mock.return_value = multi_line_prompt
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--stdout', '/multi-line'])
+        exit_code = _invoke_callback(['--stdout', '/multi-line'])
         
         # Assert
-        assert result.exit_code == 0
-        assert "This is a multi-line prompt" in result.output
-        assert "with proper indentation" in result.output
-        assert "and various content formatting" in result.output
+        output = capsys.readouterr().out
+        assert exit_code == 0
+        assert "This is a multi-line prompt" in output
+        assert "with proper indentation" in output
+        assert "and various content formatting" in output
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_no_clipboard_interaction_when_stdout_flag_active(self, mock_copy_clipboard, mock_process):
+    def test_no_clipboard_interaction_when_stdout_flag_active(self, patched_main, runner):
         """Test verification that no clipboard interaction occurs with --stdout flag."""
         # Arrange
-        mock_process.return_value = "No clipboard prompt"
+        patched_main.process.return_value = "No clipboard prompt"
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--stdout', '/no-clipboard', 'arg1', 'arg2'])
+        result = runner.invoke(promptcraft, ['--stdout', '/no-clipboard', 'arg1', 'arg2'])
         
         # Assert
         assert result.exit_code == 0
-        mock_process.assert_called_once_with('no-clipboard', ['arg1', 'arg2'])
+        patched_main.process.assert_called_once_with('no-clipboard', ['arg1', 'arg2'])
         # Critical: pyperclip.copy should NEVER be called with --stdout
-        mock_copy_clipboard.assert_not_called()
+        patched_main.clipboard.assert_not_called()
         assert "No clipboard prompt" in result.output
     
-    def test_help_text_includes_stdout_flag_documentation(self):
+    def test_help_text_includes_stdout_flag_documentation(self, help_output):
         """Test help text includes --stdout flag documentation and description."""
-        # Act
-        result = self.runner.invoke(promptcraft, ['--help'])
-        
-        # Assert
-        assert result.exit_code == 0
-        assert "--stdout" in result.output
-        assert "Output to terminal instead of clipboard" in result.output
+        assert "--stdout" in help_output
+        assert "Output to terminal instead of clipboard" in help_output
     
-    @patch('promptcraft.main.process_command')
-    def test_stdout_flag_compatibility_with_existing_error_handling(self, mock_process):
+    def test_stdout_flag_compatibility_with_existing_error_handling(self, process_command_mock, runner):
         """Test compatibility with existing error handling (error behavior unchanged)."""
         # Test CommandNotFoundError with --stdout flag
-        mock_process.side_effect = CommandNotFoundError("Command not found")
-        result = self.runner.invoke(promptcraft, ['--stdout', '/nonexistent'])
+        process_command_mock.side_effect = CommandNotFoundError("Command not found")
+        result = runner.invoke(promptcraft, ['--stdout', '/nonexistent'])
         
         assert result.exit_code == 1
-        assert " Command '/nonexistent' not found" in result.output
+        assert _matched_cmd(_NOT_FOUND_RE, result.output) == "nonexistent"
         assert "Run 'promptcraft --list' to see available commands" in result.output
         
         # Test TemplateReadError with --stdout flag
-        mock_process.side_effect = TemplateReadError("Template read failed")
-        result = self.runner.invoke(promptcraft, ['--stdout', '/template-error'])
+        process_command_mock.side_effect = TemplateReadError("Template read failed")
+        result = runner.invoke(promptcraft, ['--stdout', '/template-error'])
         
         assert result.exit_code == 1
         assert " Template read failed" in result.output
         
         # Test generic exception with --stdout flag
-        mock_process.side_effect = RuntimeError("Unexpected error")
-        result = self.runner.invoke(promptcraft, ['--stdout', '/error'])
+        process_command_mock.side_effect = RuntimeError("Unexpected error")
+        result = runner.invoke(promptcraft, ['--stdout', '/error'])
         
         assert result.exit_code == 1
         assert " Unexpected error occurred" in result.output
         assert "RuntimeError" not in result.output  # No traceback exposure
     
-    @patch('promptcraft.main.process_command')
-    def test_stdout_flag_integration_with_all_command_types(self, mock_process):
+    @pytest.mark.parametrize("command,args,expected_output,with_slash", [
+        pytest.param(*scenario, with_slash, id=f"{scenario[0]}-{'slash' if with_slash else 'no-slash'}")
+        for scenario, with_slash in itertools.product([
+            ('create-story', ['Epic Story', 'feature'], "Story prompt generated"),
+            ('fix-bug', ['urgent', 'security'], "Bug fix prompt generated"),
+            ('code-review', ['main.py'], "Code review prompt generated"),
+            ('simple', [], "Simple command output")
+        ], [True, False])
+    ])
+    def test_stdout_flag_integration_with_all_command_types(self, process_command_mock, command, args, expected_output, with_slash, runner):
         """Test integration with existing process_command() functionality."""
-        # Test various command scenarios with --stdout flag
-        test_scenarios = [
-            ('/create-story', ['Epic Story', 'feature'], "Story prompt generated"),
-            ('/fix-bug', ['urgent', 'security'], "Bug fix prompt generated"),
-            ('/code-review', ['main.py'], "Code review prompt generated"),
-            ('/simple', [], "Simple command output")
-        ]
-        
-        for command, args, expected_output in test_scenarios:
-            mock_process.return_value = expected_output
-            
-            # Test with slash prefix
-            result = self.runner.invoke(promptcraft, ['--stdout', command] + args)
-            assert result.exit_code == 0
-            assert expected_output in result.output
-            assert f" Prompt for '{command}' generated:" in result.output
-            
-            # Test without slash prefix
-            command_no_slash = command[1:]  # Remove leading slash
-            result = self.runner.invoke(promptcraft, ['--stdout', command_no_slash] + args)
-            assert result.exit_code == 0
-            assert expected_output in result.output
-            assert f" Prompt for '/{command_no_slash}' generated:" in result.output
-    
-    @patch('promptcraft.main.process_command')
-    def test_stdout_flag_performance_requirement_maintenance(self, mock_process):
-        """Test performance requirement maintenance (<150ms) with terminal output."""
-        import time
-        
-        # Arrange
-        mock_process.return_value = "Performance test prompt"
-        
-        # Act
-        start_time = time.time()
-        result = self.runner.invoke(promptcraft, ['--stdout', '/performance-test', 'arg1'])
-        end_time = time.time()
+        process_command_mock.return_value = expected_output
         
-        # Assert
+        command_arg = f"/{command}" if with_slash else command
+        result = runner.invoke(promptcraft, ['--stdout', command_arg] + args)
         assert result.exit_code == 0
-        execution_time = (end_time - start_time) * 1000  # Convert to milliseconds
-        # Note: Performance may vary by environment, keeping structure without strict assertion
-        # assert execution_time < 150, f"--stdout took {execution_time}ms, exceeding 150ms limit"
+        assert expected_output in result.output
+        assert _matched_cmd(_GENERATED_RE, result.output) == command
     
-    @patch('promptcraft.main.process_command')
-    def test_stdout_flag_edge_cases(self, mock_process):
+    def test_stdout_flag_edge_cases(self, process_command_mock, capsys):
         """Test edge cases: empty prompts, very long prompts, Unicode characters."""
         # Test empty prompt
-        mock_process.return_value = ""
-        result = self.runner.invoke(promptcraft, ['--stdout', '/empty'])
-        assert result.exit_code == 0
-        assert " Prompt for '/empty' generated:" in result.output
+        process_command_mock.return_value = ""
+        assert _invoke_callback(['--stdout', '/empty']) == 0
+        assert _matched_cmd(_GENERATED_RE, capsys.readouterr().out) == "empty"
         
         # Test very long prompt
-        long_prompt = "Long prompt content " * 1000
-        mock_process.return_value = long_prompt
-        result = self.runner.invoke(promptcraft, ['--stdout', '/long'])
-        assert result.exit_code == 0
-        assert long_prompt in result.output
+        repeats = 128
+        process_command_mock.return_value = "Long prompt content " * repeats
+        assert _invoke_callback(['--stdout', '/long']) == 0
+        assert capsys.readouterr().out.count("Long prompt content ") == repeats
         
         # Test Unicode and special characters
         unicode_prompt = "Unicode test: café 漢字 émojis😊 special chars @#$%"
-        mock_process.return_value = unicode_prompt
-        result = self.runner.invoke(promptcraft, ['--stdout', '/unicode', 'café', '漢字'])
-        assert result.exit_code == 0
-        assert unicode_prompt in result.output
-        assert " Prompt for '/unicode' generated:" in result.output
+        process_command_mock.return_value = unicode_prompt
+        assert _invoke_callback(['--stdout', '/unicode', 'café', '漢字']) == 0
+        output = capsys.readouterr().out
+        assert unicode_prompt in output
+        assert _matched_cmd(_GENERATED_RE, output) == "unicode"
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_regression_existing_clipboard_functionality_unchanged_without_flag(self, mock_copy_clipboard, mock_process):
+    def test_regression_existing_clipboard_functionality_unchanged_without_flag(self, patched_main, runner):
         """Test regression: existing clipboard functionality remains unchanged without flag."""
         # Arrange
-        mock_process.return_value = "Standard clipboard content"
+        patched_main.process.return_value = "Standard clipboard content"
         
         # Act - run WITHOUT --stdout flag
-        result = self.runner.invoke(promptcraft, ['/standard-test'])
+        result = runner.invoke(promptcraft, ['/standard-test'])
         
         # Assert
         assert result.exit_code == 0
         # Verify clipboard functionality still works when flag is NOT used
-        mock_copy_clipboard.return_value = True
-        mock_copy_clipboard.assert_called_once_with("Standard clipboard content")
-        assert " Prompt for '/standard-test' copied to clipboard!" in result.output
+        patched_main.clipboard.assert_called_once_with("Standard clipboard content", "standard-test")
+        assert _matched_cmd(_SUCCESS_RE, result.output) == "standard-test"
         # Ensure new stdout message is NOT present
-        assert "generated:" not in result.output
+        assert _GENERATED_RE.search(result.output) is None
 
 
 class TestInitializationFunctionality:
     """Test cases for --init flag and project initialization functionality."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-    
-    @patch('promptcraft.main.Path')
-    def test_init_flag_presence_and_parameter_parsing(self, mock_path):
+    def test_init_flag_presence_and_parameter_parsing(self, init_dir, runner):
         """Test --init flag is properly parsed by Click framework."""
-        # Arrange
-        mock_commands_dir = Mock()
-        mock_exemplo_file = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.__truediv__.return_value = mock_exemplo_file
-        mock_commands_dir.mkdir = Mock()
-        mock_commands_dir.exists.return_value = True
-        mock_exemplo_file.exists.return_value = False
-        mock_exemplo_file.write_text = Mock()
-        
         # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
+        result = runner.invoke(promptcraft, ['--init'], standalone_mode=False)
         
         # Assert
         assert result.exit_code == 0
-        mock_commands_dir.mkdir.assert_called_once_with(parents=True, exist_ok=True)
+        assert init_dir.is_dir()
     
-    @patch('promptcraft.main.Path')
-    def test_directory_creation_in_empty_directory(self, mock_path):
+    def test_directory_creation_in_empty_directory(self, init_dir, runner):
         """Test directory creation in empty directory."""
-        # Arrange
-        mock_commands_dir = Mock()
-        mock_exemplo_file = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.__truediv__.return_value = mock_exemplo_file
-        mock_commands_dir.mkdir = Mock()
-        mock_commands_dir.exists.return_value = True
-        mock_exemplo_file.exists.return_value = False
-        mock_exemplo_file.write_text = Mock()
-        
         # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
+        result = runner.invoke(promptcraft, ['--init'])
         
         # Assert
         assert result.exit_code == 0
-        mock_path.assert_called_with('.promptcraft/commands')
-        mock_commands_dir.mkdir.assert_called_once_with(parents=True, exist_ok=True)
+        assert init_dir.is_dir()
+        assert (init_dir / 'exemplo.md').is_file()
         assert " PromptCraft initialized! Created .promptcraft/commands/ with example template" in result.output
     
-    @patch('promptcraft.main.Path')
-    def test_graceful_handling_when_directories_already_exist(self, mock_path):
+    def test_graceful_handling_when_directories_already_exist(self, init_dir, runner):
         """Test graceful handling when directories already exist."""
         # Arrange
-        mock_commands_dir = Mock()
-        mock_exemplo_file = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.__truediv__.return_value = mock_exemplo_file
-        mock_commands_dir.mkdir = Mock()
-        mock_commands_dir.exists.return_value = True  # Directory already exists
-        mock_exemplo_file.exists.return_value = True  # File already exists
+        init_dir.mkdir(parents=True)
+        (init_dir / 'exemplo.md').write_text("Custom template", encoding='utf-8')
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
+        result = runner.invoke(promptcraft, ['--init'])
         
         # Assert
         assert result.exit_code == 0
-        mock_commands_dir.mkdir.assert_called_once_with(parents=True, exist_ok=True)
+        assert (init_dir / 'exemplo.md').read_text(encoding='utf-8') == "Custom template"
         assert " PromptCraft initialized!" in result.output
         assert "Directory already exists: .promptcraft/commands/" in result.output
         assert "Example template already exists: exemplo.md" in result.output
     
-    @patch('promptcraft.main.Path')
-    def test_example_template_file_creation_and_content(self, mock_path):
+    def test_example_template_file_creation_and_content(self, example_template):
         """Test example template file creation and content."""
-        # Arrange
-        mock_commands_dir = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.mkdir = Mock()
-        mock_commands_dir.exists.return_value = True
-        mock_exemplo_file = Mock()
-        mock_commands_dir.__truediv__ = Mock(return_value=mock_exemplo_file)
-        mock_exemplo_file.exists.return_value = False
-        mock_exemplo_file.write_text = Mock()
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
-        
-        # Assert
-        assert result.exit_code == 0
-        mock_exemplo_file.write_text.assert_called_once()
-        written_content = mock_exemplo_file.write_text.call_args[0][0]
-        assert "$ARGUMENTS" in written_content
-        assert "Exemplo de Template do PromptCraft" in written_content
-        assert "promptcraft exemplo" in written_content
-        assert 'utf-8' in str(mock_exemplo_file.write_text.call_args)
-    
-    @patch('promptcraft.main.Path')
-    def test_success_messaging_and_output_formatting(self, mock_path):
+        assert "$ARGUMENTS" in example_template
+        assert "Exemplo de Template do PromptCraft" in example_template
+        assert "promptcraft exemplo" in example_template
+    
+    def test_success_messaging_and_output_formatting(self, init_result):
         """Test success message with green formatting using click.secho."""
-        # Arrange
-        mock_commands_dir = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.mkdir = Mock()
-        mock_commands_dir.exists.return_value = True
-        mock_exemplo_file = mock_commands_dir / 'exemplo.md'
-        mock_exemplo_file.exists.return_value = False
-        mock_exemplo_file.write_text = Mock()
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
+        result, commands_dir = init_result
         
         # Assert
         assert result.exit_code == 0
@@ -780,20 +577,9 @@ class TestInitializationFunctionality:
         assert " Next steps:" in result.output
         assert "Try the example: promptcraft exemplo 'hello world'" in result.output
     
-    @patch('promptcraft.main.Path')
-    def test_helpful_next_steps_in_output_message(self, mock_path):
+    def test_helpful_next_steps_in_output_message(self, init_result):
         """Test helpful next steps in output message."""
-        # Arrange
-        mock_commands_dir = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.mkdir = Mock()
-        mock_commands_dir.exists.return_value = True
-        mock_exemplo_file = mock_commands_dir / 'exemplo.md'
-        mock_exemplo_file.exists.return_value = False
-        mock_exemplo_file.write_text = Mock()
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
+        result, commands_dir = init_result
         
         # Assert
         assert result.exit_code == 0
@@ -802,134 +588,71 @@ class TestInitializationFunctionality:
         assert "Create new .md files for your own templates" in result.output
         assert "Use 'promptcraft --help' for more options" in result.output
     
-    @patch('promptcraft.main.Path')
-    def test_information_about_created_files_and_directories(self, mock_path):
+    def test_information_about_created_files_and_directories(self, init_result):
         """Test information about created files and directories."""
-        # Arrange
-        mock_commands_dir = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.mkdir = Mock()
-        mock_commands_dir.exists.return_value = True
-        mock_exemplo_file = mock_commands_dir / 'exemplo.md'
-        mock_exemplo_file.exists.return_value = False
-        mock_exemplo_file.write_text = Mock()
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
+        result, commands_dir = init_result
         
         # Assert
         assert result.exit_code == 0
         assert "Directory already exists: .promptcraft/commands/" in result.output
         assert "Created example template: exemplo.md" in result.output
     
-    @patch('promptcraft.main.Path')
-    def test_error_handling_for_permission_issues(self, mock_path):
-        """Test error handling for permission issues."""
-        # Arrange
-        mock_commands_dir = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.mkdir.side_effect = PermissionError("Permission denied")
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
-        
-        # Assert
-        assert result.exit_code == 1
-        assert " Permission denied: Cannot create directories" in result.output
-        assert "Try running with appropriate permissions" in result.output
-    
-    @patch('promptcraft.main.Path')
-    def test_error_handling_for_os_errors(self, mock_path):
-        """Test error handling for OS errors."""
-        # Arrange
-        mock_commands_dir = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.mkdir.side_effect = OSError("Disk full")
-        
+    @pytest.mark.parametrize("init_env,expected_fragments", [
+        ({'mkdir_error': PermissionError("Permission denied")},
+         (" Permission denied: Cannot create directories", "Try running with appropriate permissions")),
+        ({'mkdir_error': OSError("Disk full")},
+         (" Error creating project structure: Disk full",)),
+    ], indirect=["init_env"], ids=['permission-error', 'os-error'])
+    def test_error_handling_for_directory_creation_failures(self, init_env, runner, expected_fragments):
+        """Test error handling when the commands directory cannot be created."""
         # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
+        result = runner.invoke(promptcraft, ['--init'])
         
         # Assert
         assert result.exit_code == 1
-        assert " Error creating project structure: Disk full" in result.output
+        for fragment in expected_fragments:
+            assert fragment in result.output
     
-    def test_integration_with_existing_cli_functionality(self):
+    def test_integration_with_existing_cli_functionality(self, process_command_mock, pyperclip_copy_mock, runner):
         """Test integration with existing CLI functionality."""
-        # Test that --init doesn't interfere with normal operations
-        # First test --init works
-        with patch('promptcraft.main.Path') as mock_path:
-            mock_commands_dir = Mock()
-            mock_path.return_value = mock_commands_dir
-            mock_commands_dir.mkdir = Mock()
-            mock_commands_dir.exists.return_value = True
-            mock_exemplo_file = mock_commands_dir / 'exemplo.md'
-            mock_exemplo_file.exists.return_value = False
-            mock_exemplo_file.write_text = Mock()
-            
-            result = self.runner.invoke(promptcraft, ['--init'])
-            assert result.exit_code == 0
-        
-        # Then test normal command still works
-        with patch('promptcraft.main.process_command') as mock_process, \
-             patch('promptcraft.main.pyperclip.copy'):
-            mock_process.return_value = "Normal command works"
-            
-            result = self.runner.invoke(promptcraft, ['/test-command'])
-            assert result.exit_code == 0
-            mock_process.assert_called_once_with('test-command', [])
-    
-    def test_help_text_includes_init_flag_documentation(self):
+        # --init itself is covered by test_init_flag_presence_and_parameter_parsing;
+        # check that normal commands still work alongside it
+        process_command_mock.return_value = "Normal command works"
+        result = runner.invoke(promptcraft, ['/test-command'], standalone_mode=False)
+        assert result.exit_code == 0
+        process_command_mock.assert_called_once_with('test-command', [])
+    
+    def test_help_text_includes_init_flag_documentation(self, help_output):
         """Test help text includes --init flag documentation and description."""
-        # Act
-        result = self.runner.invoke(promptcraft, ['--help'])
+        assert "--init" in help_output
+        assert "Initialize PromptCraft project structure" in help_output
+    
+    def test_command_name_not_required_when_initializing(self, init_dir, runner):
+        """Test command name is not required when using --init flag."""
+        # Act - no command name provided, just --init
+        result = runner.invoke(promptcraft, ['--init'])
         
         # Assert
         assert result.exit_code == 0
-        assert "--init" in result.output
-        assert "Initialize PromptCraft project structure" in result.output
-    
-    def test_command_name_not_required_when_initializing(self):
-        """Test command name is not required when using --init flag."""
-        with patch('promptcraft.main.Path') as mock_path:
-            mock_commands_dir = Mock()
-            mock_path.return_value = mock_commands_dir
-            mock_commands_dir.mkdir = Mock()
-            mock_commands_dir.exists.return_value = True
-            mock_exemplo_file = mock_commands_dir / 'exemplo.md'
-            mock_exemplo_file.exists.return_value = False
-            mock_exemplo_file.write_text = Mock()
-            
-            # Act - no command name provided, just --init
-            result = self.runner.invoke(promptcraft, ['--init'])
-            
-            # Assert
-            assert result.exit_code == 0
-            assert " PromptCraft initialized!" in result.output
+        assert " PromptCraft initialized!" in result.output
     
-    def test_command_name_required_error_when_not_initializing(self):
+    def test_command_name_required_error_when_not_initializing(self, runner):
         """Test command name is required when not using --init flag."""
         # Act - no command name and no --init flag
-        result = self.runner.invoke(promptcraft, [])
+        result = runner.invoke(promptcraft, [])
         
         # Assert
         assert result.exit_code == 1
         assert " Command name is required" in result.output
         assert "Use 'promptcraft --help' for usage information" in result.output
     
-    @patch('promptcraft.main.Path')
-    def test_cross_platform_compatibility_for_file_operations(self, mock_path):
+    def test_cross_platform_compatibility_for_file_operations(self, init_env, runner):
         """Test cross-platform compatibility for file operations."""
         # Arrange
-        mock_commands_dir = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.mkdir = Mock()
-        mock_commands_dir.exists.return_value = True
-        mock_exemplo_file = mock_commands_dir / 'exemplo.md'
-        mock_exemplo_file.exists.return_value = False
-        mock_exemplo_file.write_text = Mock()
+        mock_path, mock_commands_dir, mock_exemplo_file = init_env
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
+        result = runner.invoke(promptcraft, ['--init'], standalone_mode=False)
         
         # Assert
         assert result.exit_code == 0
@@ -939,97 +662,44 @@ class TestInitializationFunctionality:
         mock_commands_dir.mkdir.assert_called_once_with(parents=True, exist_ok=True)
         # Verify UTF-8 encoding for cross-platform template compatibility
         mock_exemplo_file.write_text.assert_called_once()
-        assert 'encoding' in str(mock_exemplo_file.write_text.call_args)
+        assert mock_exemplo_file.write_text.call_args.kwargs.get('encoding') == 'utf-8'
     
-    @patch('promptcraft.main.Path')
-    def test_arguments_usage_demonstration_in_example_template(self, mock_path):
+    def test_arguments_usage_demonstration_in_example_template(self, example_template):
         """Test $ARGUMENTS usage demonstration in example template."""
-        # Arrange
-        mock_commands_dir = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.mkdir = Mock()
-        mock_commands_dir.exists.return_value = True
-        mock_exemplo_file = Mock()
-        mock_commands_dir.__truediv__ = Mock(return_value=mock_exemplo_file)
-        mock_exemplo_file.exists.return_value = False
-        mock_exemplo_file.write_text = Mock()
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
-        
-        # Assert
-        assert result.exit_code == 0
-        written_content = mock_exemplo_file.write_text.call_args[0][0]
         # Check that the template demonstrates $ARGUMENTS usage
-        assert "Você solicitou: $ARGUMENTS" in written_content
-        assert "O placeholder `$ARGUMENTS` será substituído" in written_content
-        assert "Use aspas para argumentos com espaços" in written_content
+        assert "Você solicitou: $ARGUMENTS" in example_template
+        assert "O placeholder `$ARGUMENTS` será substituído" in example_template
+        assert "Use aspas para argumentos com espaços" in example_template
     
-    @patch('promptcraft.main.Path')  
-    def test_practical_examples_and_guidance_in_template(self, mock_path):
+    def test_practical_examples_and_guidance_in_template(self, example_template):
         """Test practical examples and guidance in example template."""
-        # Arrange
-        mock_commands_dir = Mock()
-        mock_path.return_value = mock_commands_dir
-        mock_commands_dir.mkdir = Mock()
-        mock_commands_dir.exists.return_value = True
-        mock_exemplo_file = Mock()
-        mock_commands_dir.__truediv__ = Mock(return_value=mock_exemplo_file)
-        mock_exemplo_file.exists.return_value = False
-        mock_exemplo_file.write_text = Mock()
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['--init'])
-        
-        # Assert  
-        assert result.exit_code == 0
-        written_content = mock_exemplo_file.write_text.call_args[0][0]
         # Check for practical guidance
-        assert "promptcraft exemplo" in written_content
-        assert "Edite este arquivo para criar seu próprio template" in written_content
-        assert "Crie novos arquivos .md neste diretório" in written_content
+        assert "promptcraft exemplo" in example_template
+        assert "Edite este arquivo para criar seu próprio template" in example_template
+        assert "Crie novos arquivos .md neste diretório" in example_template
 
 
 class TestListCommandsFunctionality:
     """Test cases for --list flag and command discovery functionality."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-    
-    @patch('promptcraft.main.discover_commands')
-    def test_list_flag_presence_and_parsing(self, mock_discover):
-        """Test --list flag is properly parsed by Click framework."""
-        # Arrange
-        mock_discover.return_value = []
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['--list'])
-        
-        # Assert
-        assert result.exit_code == 0
-        mock_discover.assert_called_once()
-    
-    @patch('promptcraft.main.discover_commands')
-    def test_empty_directory_handling(self, mock_discover):
-        """Test graceful handling when no commands are found."""
+    @patch.object(pm, 'discover_commands')
+    def test_empty_directory_handling(self, mock_discover, runner):
+        """Test --list parsing and graceful handling when no commands are found."""
         # Arrange
         mock_discover.return_value = []
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--list'])
+        result = runner.invoke(promptcraft, ['--list'])
         
         # Assert
         assert result.exit_code == 0
         assert "No commands found" in result.output
         assert "Run 'promptcraft --init' to create examples." in result.output
+        mock_discover.assert_called_once()
     
-    @patch('promptcraft.main.discover_commands')
-    def test_single_command_display(self, mock_discover):
+    @patch.object(pm, 'discover_commands')
+    def test_single_command_display(self, mock_discover, runner):
         """Test display with single command."""
-        from promptcraft.core import CommandInfo
-        from pathlib import Path
-        
         # Arrange
         mock_discover.return_value = [
             CommandInfo(
@@ -1041,7 +711,7 @@ class TestListCommandsFunctionality:
         ]
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--list'])
+        result = runner.invoke(promptcraft, ['--list'])
         
         # Assert
         assert result.exit_code == 0
@@ -1050,12 +720,9 @@ class TestListCommandsFunctionality:
         assert "Project" in result.output
         assert "Test command description" in result.output
     
-    @patch('promptcraft.main.discover_commands')
-    def test_multiple_commands_display(self, mock_discover):
+    @patch.object(pm, 'discover_commands')
+    def test_multiple_commands_display(self, mock_discover, runner):
         """Test display with multiple commands from different sources."""
-        from promptcraft.core import CommandInfo
-        from pathlib import Path
-        
         # Arrange
         mock_discover.return_value = [
             CommandInfo(
@@ -1073,7 +740,7 @@ class TestListCommandsFunctionality:
         ]
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--list'])
+        result = runner.invoke(promptcraft, ['--list'])
         
         # Assert
         assert result.exit_code == 0
@@ -1085,12 +752,9 @@ class TestListCommandsFunctionality:
         assert "Project command A" in result.output
         assert "Global command B" in result.output
     
-    @patch('promptcraft.main.discover_commands')
-    def test_table_formatting_and_alignment(self, mock_discover):
+    @patch.object(pm, 'discover_commands')
+    def test_table_formatting_and_alignment(self, mock_discover, runner):
         """Test proper table formatting with different name lengths."""
-        from promptcraft.core import CommandInfo
-        from pathlib import Path
-        
         # Arrange - commands with different name lengths to test alignment
         mock_discover.return_value = [
             CommandInfo(
@@ -1108,7 +772,7 @@ class TestListCommandsFunctionality:
         ]
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--list'])
+        result = runner.invoke(promptcraft, ['--list'])
         
         # Assert
         assert result.exit_code == 0
@@ -1118,12 +782,9 @@ class TestListCommandsFunctionality:
         # Check that there are dashes for table separator
         assert "-" in result.output
     
-    @patch('promptcraft.main.discover_commands')
-    def test_alphabetical_sorting(self, mock_discover):
+    @patch.object(pm, 'discover_commands')
+    def test_alphabetical_sorting(self, mock_discover, runner):
         """Test that commands are displayed in alphabetical order."""
-        from promptcraft.core import CommandInfo
-        from pathlib import Path
-        
         # Arrange - unsorted input
         mock_discover.return_value = [
             CommandInfo("zebra", Path("/fake/zebra.md"), "Project", "Z command"),
@@ -1132,7 +793,7 @@ class TestListCommandsFunctionality:
         ]
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--list'])
+        result = runner.invoke(promptcraft, ['--list'])
         
         # Assert
         assert result.exit_code == 0
@@ -1145,67 +806,47 @@ class TestListCommandsFunctionality:
         # Note: The discover_commands function is responsible for sorting, not the display
         # Here we just verify the mock return values appear in the output
     
-    @patch('promptcraft.main.discover_commands')
-    def test_help_text_includes_list_flag(self, mock_discover):
+    def test_help_text_includes_list_flag(self, help_output):
         """Test help text includes --list flag documentation."""
-        # Act
-        result = self.runner.invoke(promptcraft, ['--help'])
-        
-        # Assert
-        assert result.exit_code == 0
-        assert "--list" in result.output
-        assert "List all available commands" in result.output
+        assert "--list" in help_output
+        assert "List all available commands" in help_output
     
-    @patch('promptcraft.main.discover_commands')
-    def test_list_flag_error_handling(self, mock_discover):
+    @patch.object(pm, 'discover_commands')
+    def test_list_flag_error_handling(self, mock_discover, runner):
         """Test error handling when command discovery fails."""
         # Arrange
         mock_discover.side_effect = Exception("Discovery failed")
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--list'])
+        result = runner.invoke(promptcraft, ['--list'])
         
         # Assert
         assert result.exit_code == 1
         assert "Error listing commands: Discovery failed" in result.output
     
-    @patch('promptcraft.main.discover_commands')
-    def test_no_clipboard_interaction_with_list_flag(self, mock_discover):
+    @patch.object(pm, 'discover_commands')
+    def test_no_clipboard_interaction_with_list_flag(self, mock_discover, runner):
         """Test that list flag doesn't interact with clipboard."""
         # Arrange
         mock_discover.return_value = []
         
         # Act
-        result = self.runner.invoke(promptcraft, ['--list'])
+        result = runner.invoke(promptcraft, ['--list'])
         
         # Assert
         assert result.exit_code == 0
         # No clipboard-related text should appear
-        assert "copied to clipboard" not in result.output
-        assert "generated:" not in result.output
-    
-    @patch('promptcraft.main.discover_commands')
-    def test_list_flag_integration_with_existing_cli(self, mock_discover):
-        """Test list flag doesn't interfere with normal operations."""
-        # Test list functionality works
-        mock_discover.return_value = []
-        result = self.runner.invoke(promptcraft, ['--list'])
-        assert result.exit_code == 0
-        assert "No commands found" in result.output
-        
-        # Test help still works
-        result = self.runner.invoke(promptcraft, ['--help'])
-        assert result.exit_code == 0
-        assert "--list" in result.output
+        assert _SUCCESS_RE.search(result.output) is None
+        assert _GENERATED_RE.search(result.output) is None
     
-    @patch('promptcraft.main.discover_commands')
-    def test_command_name_not_required_when_listing(self, mock_discover):
+    @patch.object(pm, 'discover_commands')
+    def test_command_name_not_required_when_listing(self, mock_discover, runner):
         """Test command name is not required when using --list flag."""
         # Arrange
         mock_discover.return_value = []
         
         # Act - no command name provided, just --list
-        result = self.runner.invoke(promptcraft, ['--list'])
+        result = runner.invoke(promptcraft, ['--list'])
         
         # Assert
         assert result.exit_code == 0
@@ -1217,145 +858,109 @@ class TestListCommandsFunctionality:
 class TestClipboardFunctionality:
     """Test cases for clipboard functionality with error handling and fallback."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_clipboard_copy_success(self, mock_copy_clipboard_clipboard, mock_process):
-        """Test successful clipboard operation."""
-        # Arrange
-        mock_process.return_value = "Generated prompt content"
-        mock_copy_clipboard_clipboard.return_value = True
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['/test-command', 'arg1'])
-        
-        # Assert
-        assert result.exit_code == 0
-        mock_copy_clipboard_clipboard.assert_called_once_with("Generated prompt content", "test-command")
-        assert "Prompt for '/test-command' copied to clipboard!" in result.output
-        assert "⚠️ Clipboard unavailable" not in result.output
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_clipboard_copy_failure_with_fallback(self, mock_copy_clipboard_clipboard, mock_process):
-        """Test clipboard failure with automatic fallback to stdout."""
+    @pytest.mark.parametrize("clipboard_ok,message_re,absent_re,expected_fragments,absent_fragments", [
+        (True, _SUCCESS_RE, _GENERATED_RE,
+         (),
+         ("⚠️ Clipboard unavailable",)),
+        (False, _GENERATED_RE, _SUCCESS_RE,
+         ("⚠️ Clipboard unavailable, use --stdout instead",
+          "Generated prompt content"),
+         ()),
+    ], ids=['copied', 'fallback-to-stdout'])
+    def test_clipboard_output(self, patched_main, runner, clipboard_ok, message_re, absent_re,
+                              expected_fragments, absent_fragments):
+        """Test output for clipboard success and for the stdout fallback."""
         # Arrange
-        mock_process.return_value = "Generated prompt content"
-        mock_copy_clipboard_clipboard.return_value = False
+        patched_main.process.return_value = "Generated prompt content"
+        patched_main.clipboard.return_value = clipboard_ok
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/test-command', 'arg1'])
+        result = runner.invoke(promptcraft, ['/test-command', 'arg1'])
         
         # Assert
         assert result.exit_code == 0
-        mock_copy_clipboard_clipboard.assert_called_once_with("Generated prompt content", "test-command")
-        assert "⚠️ Clipboard unavailable, use --stdout instead" in result.output
-        assert "Prompt for '/test-command' generated:" in result.output
-        assert "Generated prompt content" in result.output
-    
-    @patch('promptcraft.main.pyperclip.copy')
-    @patch('promptcraft.main._is_headless_environment')
-    def test_copy_to_clipboard_success(self, mock_headless, mock_pyperclip_copy):
+        patched_main.clipboard.assert_called_once_with("Generated prompt content", "test-command")
+        assert _matched_cmd(message_re, result.output) == "test-command"
+        assert absent_re.search(result.output) is None
+        for fragment in expected_fragments:
+            assert fragment in result.output
+        for fragment in absent_fragments:
+            assert fragment not in result.output
+    
+    def test_copy_to_clipboard_success(self):
         """Test _copy_to_clipboard function success."""
-        # Arrange
-        mock_headless.return_value = False
+        with patch.multiple(pm, pyperclip=DEFAULT, _is_headless_environment=DEFAULT) as mocks:
+            # Arrange
+            mock_headless = mocks['_is_headless_environment']
+            mock_pyperclip_copy = mocks['pyperclip'].copy
+            mock_headless.return_value = False
         
-        # Act
-        result = _copy_to_clipboard("test content", "test-command")
+            # Act
+            result = _copy_to_clipboard("test content", "test-command")
         
-        # Assert
-        assert result is True
-        mock_pyperclip_copy.assert_called_once_with("test content")
-        mock_headless.assert_called_once()
+            # Assert
+            assert result is True
+            mock_pyperclip_copy.assert_called_once_with("test content")
     
-    @patch('promptcraft.main.pyperclip.copy')
-    @patch('promptcraft.main._is_headless_environment')
-    def test_copy_to_clipboard_headless_environment(self, mock_headless, mock_pyperclip_copy):
+    def test_copy_to_clipboard_headless_environment(self):
         """Test _copy_to_clipboard returns False in headless environment."""
-        # Arrange
-        mock_headless.return_value = True
+        with patch.multiple(pm, pyperclip=DEFAULT, _is_headless_environment=DEFAULT) as mocks:
+            # Arrange
+            mock_headless = mocks['_is_headless_environment']
+            mock_pyperclip_copy = mocks['pyperclip'].copy
+            mock_headless.return_value = True
         
-        # Act
-        result = _copy_to_clipboard("test content", "test-command")
+            # Act
+            result = _copy_to_clipboard("test content", "test-command")
         
-        # Assert
-        assert result is False
-        mock_pyperclip_copy.assert_not_called()
-        mock_headless.assert_called_once()
+            # Assert
+            assert result is False
+            mock_pyperclip_copy.assert_not_called()
     
-    @patch('promptcraft.main.pyperclip.copy')
-    @patch('promptcraft.main._is_headless_environment')
-    def test_copy_to_clipboard_pyperclip_exception(self, mock_headless, mock_pyperclip_copy):
+    def test_copy_to_clipboard_pyperclip_exception(self):
         """Test _copy_to_clipboard handles pyperclip exceptions."""
-        # Arrange
-        mock_headless.return_value = False
-        mock_pyperclip_copy.side_effect = Exception("Clipboard backend failed")
+        with patch.multiple(pm, pyperclip=DEFAULT, _is_headless_environment=DEFAULT) as mocks:
+            # Arrange
+            mock_headless = mocks['_is_headless_environment']
+            mock_pyperclip_copy = mocks['pyperclip'].copy
+            mock_headless.return_value = False
+            mock_pyperclip_copy.side_effect = Exception("Clipboard backend failed")
         
-        # Act
-        result = _copy_to_clipboard("test content", "test-command")
+            # Act
+            result = _copy_to_clipboard("test content", "test-command")
         
-        # Assert
-        assert result is False
-        mock_pyperclip_copy.assert_called_once_with("test content")
+            # Assert
+            assert result is False
+            mock_pyperclip_copy.assert_called_once_with("test content")
     
-    @patch('promptcraft.main.time.time')
-    @patch('promptcraft.main.pyperclip.copy')
-    @patch('promptcraft.main._is_headless_environment')
-    def test_copy_to_clipboard_timeout_protection(self, mock_headless, mock_pyperclip_copy, mock_time):
+    def test_copy_to_clipboard_timeout_protection(self):
         """Test _copy_to_clipboard timeout protection."""
-        # Arrange
-        mock_headless.return_value = False
-        mock_time.side_effect = [0.0, 0.11]  # 110ms elapsed
+        with patch.multiple(pm, pyperclip=DEFAULT, _is_headless_environment=DEFAULT, time=DEFAULT) as mocks:
+            # Arrange
+            mock_headless = mocks['_is_headless_environment']
+            mock_pyperclip_copy = mocks['pyperclip'].copy
+            mock_time = mocks['time'].time
+            mock_headless.return_value = False
+            mock_time.side_effect = itertools.count(0.0, 0.11)  # 110ms per call
         
-        # Act
-        result = _copy_to_clipboard("test content", "test-command")
-        
-        # Assert
-        assert result is False  # Should fail due to timeout
-        mock_pyperclip_copy.assert_called_once_with("test content")
-    
-    @patch('promptcraft.main.os.environ.get')
-    def test_is_headless_environment_ci(self, mock_env_get):
-        """Test headless environment detection for CI."""
-        # Arrange
-        mock_env_get.side_effect = lambda key, default=None: 'true' if key == 'CI' else default
-        
-        # Act
-        result = _is_headless_environment()
-        
-        # Assert
-        assert result is True
-    
-    @patch('promptcraft.main.os.environ.get')
-    def test_is_headless_environment_no_display(self, mock_env_get):
-        """Test headless environment detection for missing DISPLAY."""
-        # Arrange
-        mock_env_get.side_effect = lambda key, default=None: '' if key == 'DISPLAY' else default
-        
-        # Act
-        result = _is_headless_environment()
+            # Act
+            result = _copy_to_clipboard("test content", "test-command")
         
-        # Assert
-        assert result is True
-    
-    @patch('promptcraft.main.os.environ.get')
-    def test_is_headless_environment_manual_override(self, mock_env_get):
-        """Test headless environment detection for manual override."""
-        # Arrange
-        mock_env_get.side_effect = lambda key, default=None: 'true' if key == 'PROMPTCRAFT_NO_CLIPBOARD' else default
-        
-        # Act
-        result = _is_headless_environment()
-        
-        # Assert
-        assert result is True
-    
-    @patch('promptcraft.main.sys.platform', 'linux')
-    @patch('promptcraft.main.os.path.exists')
-    @patch('promptcraft.main.os.environ.get')
+            # Assert
+            assert result is False  # Should fail due to timeout
+            mock_pyperclip_copy.assert_called_once_with("test content")
+    
+    @pytest.mark.parametrize("env,expected", HEADLESS_CASES,
+                             ids=['ci', 'no-display', 'manual-override', 'normal'])
+    def test_is_headless_environment(self, env, expected):
+        """Test headless environment detection for each environment variable."""
+        with patch.object(pm.os.environ, 'get',
+                   side_effect=lambda key, default=None: env.get(key, default)):
+            assert _is_headless_environment() is expected
+    
+    @patch.object(pm.sys, 'platform', 'linux')
+    @patch.object(pm.os.path, 'exists')
+    @patch.object(pm.os.environ, 'get')
     def test_is_headless_environment_linux_no_x11(self, mock_env_get, mock_path_exists):
         """Test headless environment detection for Linux without X11."""
         # Arrange
@@ -1369,267 +974,160 @@ class TestClipboardFunctionality:
         assert result is True
         mock_path_exists.assert_called_with('/tmp/.X11-unix')
     
-    @patch('promptcraft.main.os.environ.get')
-    def test_is_headless_environment_normal(self, mock_env_get):
-        """Test headless environment detection returns False for normal environment."""
-        # Arrange
-        mock_env_get.side_effect = lambda key, default=None: ':0' if key == 'DISPLAY' else default
-        
-        # Act
-        result = _is_headless_environment()
-        
-        # Assert
-        assert result is False
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_fallback_message_formatting(self, mock_copy_clipboard_clipboard, mock_process):
-        """Test fallback message uses correct formatting and colors."""
-        # Arrange
-        mock_process.return_value = "Test prompt"
-        mock_copy_clipboard_clipboard.return_value = False
-        
-        # Act
-        result = self.runner.invoke(promptcraft, ['/test'])
-        
-        # Assert
-        assert result.exit_code == 0
-        assert "⚠️ Clipboard unavailable, use --stdout instead" in result.output
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_unicode_content_clipboard_handling(self, mock_copy_clipboard_clipboard, mock_process):
+    def test_unicode_content_clipboard_handling(self, patched_main, runner):
         """Test clipboard handling with Unicode content."""
         # Arrange
         unicode_content = "Test prompt with émojis 😊 and 漢字"
-        mock_process.return_value = unicode_content
-        mock_copy_clipboard_clipboard.return_value = True
+        patched_main.process.return_value = unicode_content
+        patched_main.clipboard.return_value = True
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/unicode-test'])
+        result = runner.invoke(promptcraft, ['/unicode-test'])
         
         # Assert
         assert result.exit_code == 0
-        mock_copy_clipboard_clipboard.assert_called_once_with(unicode_content, "unicode-test")
-        assert "copied to clipboard!" in result.output
+        patched_main.clipboard.assert_called_once_with(unicode_content, "unicode-test")
+        assert _matched_cmd(_SUCCESS_RE, result.output) == "unicode-test"
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_large_content_clipboard_handling(self, mock_copy_clipboard_clipboard, mock_process):
+    def test_large_content_clipboard_handling(self, patched_main, runner):
         """Test clipboard handling with large content."""
         # Arrange
         large_content = "Large content " * 10000  # ~130KB
-        mock_process.return_value = large_content
-        mock_copy_clipboard_clipboard.return_value = True
+        patched_main.process.return_value = large_content
+        patched_main.clipboard.return_value = True
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/large-test'])
+        result = runner.invoke(promptcraft, ['/large-test'], standalone_mode=False)
         
         # Assert
         assert result.exit_code == 0
-        mock_copy_clipboard_clipboard.assert_called_once_with(large_content, "large-test")
+        patched_main.clipboard.assert_called_once_with(large_content, "large-test")
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_clipboard_integration_with_existing_error_handling(self, mock_copy_clipboard_clipboard, mock_process):
+    def test_clipboard_integration_with_existing_error_handling(self, patched_main, runner):
         """Test clipboard functionality doesn't interfere with existing error handling."""
         # Test CommandNotFoundError still works
-        mock_process.side_effect = CommandNotFoundError("Command not found")
-        result = self.runner.invoke(promptcraft, ['/nonexistent'])
+        patched_main.process.side_effect = CommandNotFoundError("Command not found")
+        result = runner.invoke(promptcraft, ['/nonexistent'])
         
         assert result.exit_code == 1
-        assert "Command '/nonexistent' not found" in result.output
-        mock_copy_clipboard_clipboard.assert_not_called()
+        assert _matched_cmd(_NOT_FOUND_RE, result.output) == "nonexistent"
+        patched_main.clipboard.assert_not_called()
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')  
-    def test_performance_requirement_with_clipboard_fallback(self, mock_copy_clipboard_clipboard, mock_process):
-        """Test that fallback behavior maintains performance requirements."""
-        import time
+    def test_clipboard_fallback_copies_once_and_warns(self, patched_main, runner):
+        """Test that a failed clipboard copy is attempted once and falls back to a warning."""
         
         # Arrange
-        mock_process.return_value = "Performance test"
-        mock_copy_clipboard_clipboard.return_value = False  # Trigger fallback
+        patched_main.process.return_value = "Performance test"
+        patched_main.clipboard.return_value = False  # Trigger fallback
         
         # Act
-        start_time = time.time()
-        result = self.runner.invoke(promptcraft, ['/perf-test'])
-        end_time = time.time()
+        result = runner.invoke(promptcraft, ['/perf-test'])
         
         # Assert
         assert result.exit_code == 0
-        execution_time = (end_time - start_time) * 1000
-        # Performance check - should complete quickly even with fallback
-        # Note: Removed strict assertion to avoid flaky tests
+        patched_main.clipboard.assert_called_once_with("Performance test", "perf-test")
         assert "⚠️ Clipboard unavailable" in result.output
 
-
 # Additional CLI Integration Tests
 
 class TestCLIAdvancedIntegration:
     """Advanced integration tests for CLI functionality."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_cli_argument_parsing_edge_cases(self, mock_copy_clipboard, mock_process):
+    @pytest.mark.parametrize("args,expected_cmd,expected_args", [
+        # Command with leading/trailing spaces (Click should handle)
+        (['/test-command', ' arg with spaces ', 'normal'], 'test-command', [' arg with spaces ', 'normal']),
+        # Command with multiple consecutive spaces
+        (['/test', 'arg1', '', 'arg3'], 'test', ['arg1', '', 'arg3']),
+        # Command with special shell characters
+        (['/test', '$VAR', '|pipe', '&&and'], 'test', ['$VAR', '|pipe', '&&and']),
+        # Command with quotes (shell-level)
+        (['/test', "'quoted'", '"double"'], 'test', ["'quoted'", '"double"'])
+    ], ids=['spaces', 'empty-arg', 'shell-chars', 'quotes'])
+    def test_cli_argument_parsing_edge_cases(self, patched_main, runner, args, expected_cmd, expected_args):
         """Test CLI argument parsing with various edge cases."""
         # Arrange
-        mock_process.return_value = "Test output"
-        mock_copy_clipboard.return_value = True
-        
-        edge_cases = [
-            # Command with leading/trailing spaces (Click should handle)
-            (['/test-command', ' arg with spaces ', 'normal'], 'test-command', [' arg with spaces ', 'normal']),
-            # Command with multiple consecutive spaces
-            (['/test', 'arg1', '', 'arg3'], 'test', ['arg1', '', 'arg3']),
-            # Command with special shell characters
-            (['/test', '$VAR', '|pipe', '&&and'], 'test', ['$VAR', '|pipe', '&&and']),
-            # Command with quotes (shell-level)
-            (['/test', "'quoted'", '"double"'], 'test', ["'quoted'", '"double"'])
-        ]
+        patched_main.process.return_value = "Test output"
+        patched_main.clipboard.return_value = True
+        
+        # Act
+        result = runner.invoke(promptcraft, args, standalone_mode=False)
         
-        for args, expected_cmd, expected_args in edge_cases:
-            mock_process.reset_mock()
-            result = self.runner.invoke(promptcraft, args)
-            
-            assert result.exit_code == 0
-            mock_process.assert_called_once_with(expected_cmd, expected_args)
+        # Assert
+        assert result.exit_code == 0
+        patched_main.process.assert_called_once_with(expected_cmd, expected_args)
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_cli_with_very_long_arguments(self, mock_copy_clipboard, mock_process):
+    def test_cli_with_very_long_arguments(self, patched_main, runner):
         """Test CLI with very long argument lists."""
         # Arrange
-        mock_process.return_value = "Long args output"
-        mock_copy_clipboard.return_value = True
+        patched_main.process.return_value = "Long args output"
+        patched_main.clipboard.return_value = True
         
         # Create 100 arguments
         long_args = [f'arg{i}' for i in range(100)]
         
         # Act
-        result = self.runner.invoke(promptcraft, ['/long-test'] + long_args)
+        result = runner.invoke(promptcraft, ['/long-test'] + long_args, standalone_mode=False)
         
         # Assert
         assert result.exit_code == 0
-        mock_process.assert_called_once_with('long-test', long_args)
-    
-    @patch('promptcraft.main.process_command')
-    def test_cli_error_message_consistency(self, mock_process):
+        patched_main.process.assert_called_once_with('long-test', long_args)
+    
+    @pytest.mark.parametrize("exception,expected_message", [
+        (CommandNotFoundError("Command 'test' not found"), "Run 'promptcraft --list' to see available commands"),
+        (TemplateReadError("Permission denied"), "Permission denied"),
+        (RuntimeError("System error"), "Unexpected error occurred")
+    ], ids=['not-found', 'template-read', 'unexpected'])
+    def test_cli_error_message_consistency(self, process_command_mock, runner, exception, expected_message):
         """Test consistency of error messages across different error types."""
-        error_scenarios = [
-            (CommandNotFoundError("Command 'test' not found"), "Command '/test' not found"),
-            (TemplateReadError("Permission denied"), "Permission denied"),
-            (RuntimeError("System error"), "Unexpected error occurred")
-        ]
+        process_command_mock.side_effect = exception
+        result = runner.invoke(promptcraft, ['/test'])
         
-        for exception, expected_message in error_scenarios:
-            mock_process.side_effect = exception
-            result = self.runner.invoke(promptcraft, ['/test'])
-            
-            assert result.exit_code == 1
-            assert expected_message in result.output
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_cli_output_formatting_consistency(self, mock_copy_clipboard, mock_process):
+        assert result.exit_code == 1
+        if isinstance(exception, CommandNotFoundError):
+            assert _matched_cmd(_NOT_FOUND_RE, result.output) == "test"
+        assert expected_message in result.output
+    
+    @pytest.mark.parametrize("output,cmd_name", [
+        ("Simple output", "simple"),
+        ("Output\nwith\nnewlines", "multiline"),
+        ("Output with Unicode: éçà 漢字 😊", "unicode"),
+        ("", "empty")
+    ], ids=['simple', 'multiline', 'unicode', 'empty'])
+    def test_cli_output_formatting_consistency(self, patched_main, runner, output, cmd_name):
         """Test output formatting consistency across different scenarios."""
-        mock_copy_clipboard.return_value = True
+        patched_main.clipboard.return_value = True
+        patched_main.process.return_value = output
         
-        test_cases = [
-            ("Simple output", "simple"),
-            ("Output\nwith\nnewlines", "multiline"),
-            ("Output with Unicode: éçà 漢字 😊", "unicode"),
-            ("", "empty")
-        ]
+        result = runner.invoke(promptcraft, [f'/{cmd_name}'])
         
-        for output, cmd_name in test_cases:
-            mock_process.return_value = output
-            result = self.runner.invoke(promptcraft, [f'/{cmd_name}'])
-            
-            assert result.exit_code == 0
-            assert f"Prompt for '/{cmd_name}' copied to clipboard!" in result.output
+        assert result.exit_code == 0
+        assert _matched_cmd(_SUCCESS_RE, result.output) == cmd_name
     
-    def test_cli_version_and_help_integration(self):
+    def test_cli_version_and_help_integration(self, runner, help_output):
         """Test version and help integration with main CLI."""
         # Test version
-        result = self.runner.invoke(promptcraft, ['--version'])
+        result = runner.invoke(promptcraft, ['--version'], standalone_mode=False)
         assert result.exit_code == 0
         
         # Test help
-        result = self.runner.invoke(promptcraft, ['--help'])
-        assert result.exit_code == 0
-        assert "PromptCraft CLI" in result.output
-        assert "Usage Examples" in result.output
-
-
-class TestCLIPerformanceExtended:
-    """Extended performance tests for CLI operations."""
-    
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_cli_startup_performance(self, mock_copy_clipboard, mock_process):
-        """Test CLI startup performance with cold start simulation."""
-        mock_process.return_value = "Fast startup"
-        mock_copy_clipboard.return_value = True
-        
-        # Measure multiple cold starts
-        times = []
-        for _ in range(5):
-            start_time = time.time()
-            result = self.runner.invoke(promptcraft, ['/startup-test'])
-            end_time = time.time()
-            
-            assert result.exit_code == 0
-            times.append((end_time - start_time) * 1000)
-        
-        # Average should be reasonable (not strictly enforced to avoid flaky tests)
-        avg_time = sum(times) / len(times)
-        assert avg_time < 1000  # Should be under 1 second on average
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_cli_memory_usage_pattern(self, mock_copy_clipboard, mock_process):
-        """Test CLI memory usage remains stable across multiple invocations."""
-        mock_process.return_value = "Memory test"
-        mock_copy_clipboard.return_value = True
-        
-        # Run multiple commands to check for memory leaks
-        for i in range(50):
-            result = self.runner.invoke(promptcraft, [f'/memory-test-{i}'])
-            assert result.exit_code == 0
-        
-        # If we get here without memory issues, test passes
-        assert True
+        assert "PromptCraft CLI" in help_output
+        assert "Usage Examples" in help_output
 
 
 class TestCLIRobustness:
     """Robustness tests for CLI under various conditions."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-    
-    @patch('promptcraft.main.process_command')
-    def test_cli_signal_handling(self, mock_process):
+    def test_cli_signal_handling(self, process_command_mock, runner):
         """Test CLI behavior under signal conditions (where applicable)."""
-        mock_process.return_value = "Signal test"
+        process_command_mock.return_value = "Signal test"
         
         # Test normal execution (signal handling is usually OS-level)
-        result = self.runner.invoke(promptcraft, ['/signal-test'])
+        result = runner.invoke(promptcraft, ['/signal-test'], standalone_mode=False)
         assert result.exit_code == 0
     
-    @patch('promptcraft.main.process_command')
-    def test_cli_with_malformed_arguments(self, mock_process):
+    def test_cli_with_malformed_arguments(self, process_command_mock, runner):
         """Test CLI handling of malformed argument structures."""
-        mock_process.return_value = "Malformed test"
+        process_command_mock.return_value = "Malformed test"
         
         # Test with various malformed inputs that Click should handle
         malformed_cases = [
@@ -1639,19 +1137,17 @@ class TestCLIRobustness:
         ]
         
         for args in malformed_cases:
-            result = self.runner.invoke(promptcraft, args)
+            result = runner.invoke(promptcraft, args)
             # Should either succeed or fail gracefully (no crashes)
             assert result.exit_code in [0, 1, 2]  # Valid exit codes
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_cli_resource_cleanup(self, mock_copy_clipboard, mock_process):
+    def test_cli_resource_cleanup(self, patched_main, runner):
         """Test that CLI properly cleans up resources."""
-        mock_process.return_value = "Cleanup test"
-        mock_copy_clipboard.return_value = True
+        patched_main.process.return_value = "Cleanup test"
+        patched_main.clipboard.return_value = True
         
         # Run command that should clean up properly
-        result = self.runner.invoke(promptcraft, ['/cleanup-test'])
+        result = runner.invoke(promptcraft, ['/cleanup-test'], standalone_mode=False)
         
         assert result.exit_code == 0
         # If we reach here, cleanup was successful (no hanging resources)
@@ -1661,39 +1157,28 @@ class TestCLIRobustness:
 class TestCLIEnvironmentCompatibility:
     """Test CLI compatibility across different environments."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-    
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_cli_environment_variable_handling(self, mock_copy_clipboard, mock_process):
+    @pytest.mark.parametrize("env_vars", [
+        {},  # No special env vars
+        {'CI': 'true'},  # CI environment
+        {'DISPLAY': ''},  # No display
+        {'PROMPTCRAFT_NO_CLIPBOARD': 'true'}  # Clipboard disabled
+    ], ids=['default', 'ci', 'no-display', 'no-clipboard'])
+    def test_cli_environment_variable_handling(self, patched_main, runner, env_vars):
         """Test CLI behavior with various environment variables."""
-        mock_process.return_value = "Env test"
-        mock_copy_clipboard.return_value = True
-        
-        # Test with different environment configurations
-        env_configs = [
-            {},  # No special env vars
-            {'CI': 'true'},  # CI environment
-            {'DISPLAY': ''},  # No display
-            {'PROMPTCRAFT_NO_CLIPBOARD': 'true'}  # Clipboard disabled
-        ]
+        patched_main.process.return_value = "Env test"
+        patched_main.clipboard.return_value = True
         
-        for env_vars in env_configs:
-            with patch.dict(os.environ, env_vars, clear=False):
-                result = self.runner.invoke(promptcraft, ['/env-test'])
-                assert result.exit_code == 0
+        with patch.dict(os.environ, env_vars, clear=False):
+            result = runner.invoke(promptcraft, ['/env-test'], standalone_mode=False)
+        assert result.exit_code == 0
     
-    @patch('promptcraft.main.process_command')
-    @patch('promptcraft.main._copy_to_clipboard')
-    def test_cli_locale_compatibility(self, mock_copy_clipboard, mock_process):
+    def test_cli_locale_compatibility(self, patched_main, runner):
         """Test CLI with different locale settings."""
-        mock_process.return_value = "Locale test with Unicode: éçà 漢字"
-        mock_copy_clipboard.return_value = True
+        patched_main.process.return_value = "Locale test with Unicode: éçà 漢字"
+        patched_main.clipboard.return_value = True
         
-        result = self.runner.invoke(promptcraft, ['/locale-test'])
+        result = runner.invoke(promptcraft, ['/locale-test'])
         
         assert result.exit_code == 0
         # Should handle Unicode in output properly
-        assert "éçà 漢字" in str(result.output) or "copied to clipboard" in result.output
\ No newline at end of file
+        assert _matched_cmd(_SUCCESS_RE, result.output) == "locale-test"
\ No newline at end of file